@@ -28,10 +28,46 @@ class Settings(BaseSettings):
     query_step_years: int = 10
     query_limit: int = 500
 
+    # Ingestão em lote (POST /events/bulk)
+    bulk_batch_size: int = 5000
+    # Linhas por transação no DELETE/PATCH por filtro (evita locks longos)
+    bulk_mutation_batch_size: int = 2000
+
+    # Cache de respostas (rotas de leitura de eventos)
+    cache_max_entries: int = 256
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_max_entry_bytes: int = 8 * 1024 * 1024
+
+    # Índice de continentes em memória: intervalo entre conferências da tabela de polígonos
+    continent_index_ttl_seconds: float = 60.0
+    # Grade pré-calculada (gerada por scripts/build_continent_grid.py)
+    continent_grid_path: str = "data/continent_grid.u8"
+    # Reclassificação de continentes (POST /settings/continents/reclassify)
+    reclassify_batch_size: int = 5000
+    continent_trigger_enabled: bool = False
+
+    # Limite de pontos do POST /events/detect-continent/batch
+    detect_batch_max_points: int = 200000
+    # Maior `k` aceito no GET /events/near
+    near_max_k: int = 500
+    # Mudanças por página do GET /events/changes
+    changes_page_size: int = 1000
+    # Máximo de quadros de um GET /events/playback
+    playback_max_steps: int = 5000
+
+    # Caminho assíncrono (asyncpg) para as rotas de leitura mais acessadas
+    async_db_enabled: bool = False
+    async_db_pool_size: int = 20
+    async_db_max_overflow: int = 20
+
     @property
     def database_url(self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
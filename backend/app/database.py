@@ -1,6 +1,6 @@
 from sqlalchemy import create_engine, event, DDL # <--- 1. Adicione event e DDL aqui
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from .config import get_settings
 
@@ -10,6 +10,30 @@ engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Engine assíncrono opcional (ASYNC_DB_ENABLED=true + extra "async" instalado).
+# Quando existe, as rotas de leitura de /events rodam no event loop e a
+# concorrência passa a depender do pool de conexões, não do threadpool.
+try:
+    import asyncpg  # noqa: F401
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+except ImportError:
+    AsyncSession = None
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_db_enabled:
+    if AsyncSession is None:
+        print("⚠️  [Database] ASYNC_DB_ENABLED ignorado: instale o extra 'async' (asyncpg)")
+    else:
+        async_engine = create_async_engine(
+            settings.async_database_url,
+            pool_pre_ping=True,
+            pool_size=settings.async_db_pool_size,
+            max_overflow=settings.async_db_max_overflow
+        )
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Isso diz ao SQLAlchemy: "Antes de criar qualquer tabela, 
 # rode este comando SQL para garantir que a pasta 'settings' exista".
 event.listen(
@@ -25,4 +49,10 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally: 
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """Dependency da sessão assíncrona (só usada quando async_engine existe)."""
+    async with AsyncSessionLocal() as db:
+        yield db
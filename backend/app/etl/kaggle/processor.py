@@ -1,10 +1,12 @@
 import random
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, text, and_
+from sqlalchemy.dialects.postgresql import insert
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 from ...models import KaggleStaging, HistoricalEvent, EventSource, GeonamesCity
 from ...utils import calculate_period, get_continent_from_coords
+from ...services.response_cache import response_cache
 
 def process_staging_to_events(db: Session, kaggle_id: str, limit: int = 2000, log_callback=None, stop_check_callback=None):
     
@@ -36,6 +38,7 @@ def process_staging_to_events(db: Session, kaggle_id: str, limit: int = 2000, lo
         if stop_check_callback and stop_check_callback():
             log("🛑 Interrompido na Fase 1.")
             db.commit()
+            response_cache.bump_version()
             return processed_count
 
         try:
@@ -98,6 +101,7 @@ def process_staging_to_events(db: Session, kaggle_id: str, limit: int = 2000, lo
             row.error_msg = str(e)
     
     db.commit()
+    response_cache.bump_version()
     log(f"✅ FASE 1 Concluída. Fila API: {len(api_queue)}")
 
     # =========================================================================
@@ -138,11 +142,13 @@ def process_staging_to_events(db: Session, kaggle_id: str, limit: int = 2000, lo
                 if i % 10 == 0: 
                     log(f"🐢 Processando API: {i+1}/{len(api_queue)}")
                     db.commit()
+                    response_cache.bump_version()
 
             except Exception as e:
                 row.error_msg = str(e)
 
     db.commit()
+    response_cache.bump_version()
     log(f"🏁 Finalizado! Total: {processed_count}")
     return processed_count
 
@@ -180,29 +186,27 @@ def _save_event(db, row, lat, lon, source_label, raw):
         f"Outcome: {raw.get('Outcome', 'N/A')}"
     )
 
-    # Verifica se já existe para evitar duplicatas (Upsert Manual)
-    existing_event = db.query(HistoricalEvent).filter(
-        HistoricalEvent.name == name,
-        HistoricalEvent.year_start == year_clean
-    ).first()
-
-    if existing_event:
-        existing_event.location = location_wkt
-        existing_event.content = content_formatted
-        existing_event.continent = detected_continent # Atualiza com o detectado
-        existing_event.period = period_val
-        row.processed = True
-    else:
-        new_event = HistoricalEvent(
-            name=name,
-            description=str(raw.get("Impact", ""))[:990],
-            content=content_formatted,
-            year_start=year_clean,
-            year_end=year_clean,
-            continent=detected_continent, # Usa o detectado pelo polígono!
-            location=location_wkt,
-            source=EventSource.KAGGLE,
-            period=period_val
-        )
-        db.add(new_event)
-        row.processed = True
\ No newline at end of file
+    # Upsert nativo na chave natural (nome normalizado + ano): sobrescreve o evento do Kaggle
+    stmt = insert(HistoricalEvent).values(
+        name=name,
+        description=str(raw.get("Impact", ""))[:990],
+        content=content_formatted,
+        year_start=year_clean,
+        year_end=year_clean,
+        continent=detected_continent, # Usa o detectado pelo polígono!
+        location=location_wkt,
+        source=EventSource.KAGGLE,
+        period=period_val
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=HistoricalEvent.natural_key(),
+        set_={
+            "location": stmt.excluded.location,
+            "content": stmt.excluded.content,
+            "continent": stmt.excluded.continent,
+            "period": stmt.excluded.period
+        },
+        # Mesma regra de duplicata da API e do bulk: só sobrescreve com conteúdo mais longo
+        where=func.length(func.coalesce(stmt.excluded.content, "")) > func.length(func.coalesce(HistoricalEvent.content, ""))
+    ))
+    row.processed = True
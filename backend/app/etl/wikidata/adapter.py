@@ -48,7 +48,8 @@ class WikidataAdapter(BaseEtlAdapter):
                         longitude=event.longitude,
                         continent=event.continent,
                         period=event.period,
-                        source="wikidata"
+                        source="wikidata",
+                        sitelinks=event.sitelinks
                     )
                     EventService(db).create(event_schema)
                     total_added += 1
@@ -1,12 +1,16 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from .database import engine, Base, SessionLocal
-from .routes import events_router, settings_router, etl_router, docs_router
+from .database import engine, async_engine, Base, SessionLocal
+from .routes import events_router, events_async_router, settings_router, etl_router, docs_router
 from .config import get_settings
 from .seeders.spatial_seeder import seed_continents
 from .seeders.integrations import seed_integrations
+from .services.continent_service import ContinentService
+from .services.density_service import DensityService, run_density_rebuild
 settings = get_settings()
 
 # Cria tabelas
@@ -26,11 +30,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Compressão das respostas (GeoJSON/NDJSON são dominados por chaves repetidas)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.mount("/docs/assets", StaticFiles(directory="docs/integrations/assets"), name="docs_assets")
 
-# Rotas
+# Rotas (as assíncronas, se habilitadas, vêm antes e têm precedência)
+if async_engine is not None:
+    app.include_router(events_async_router)
 app.include_router(events_router)
 app.include_router(etl_router)
 app.include_router(settings_router)
@@ -51,6 +61,10 @@ async def startup_event():
         seed_integrations(db)
         # O seed_continents agora não vai mais falhar, pois a tabela já foi criada acima
         seed_continents(db)
+        ContinentService(db).ensure_pieces()
+        DensityService(db).ensure_centuries()
+        # Reagrega o resumo de densidade sem segurar o startup
+        asyncio.get_running_loop().run_in_executor(None, run_density_rebuild)
         print("🚀 Startup concluído com sucesso!")
     except Exception as e:
         print(f"❌ Erro no startup: {e}")
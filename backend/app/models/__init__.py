@@ -21,7 +21,9 @@ from .kaggle import KaggleStaging
 from .wikidata import WikidataExtraction
 from .geonames import GeonamesCity
 from .integrations import IntegrationDefinition, UserIntegration
-from .spatial import ContinentShape
+from .spatial import ContinentShape, ContinentPiece
+from .stats import EventYearCount, EventDensityCell, EventDensityCentury
+from .changes import EventTombstone, EventDuplicateRemoved
 
 __all__ = [
     "HistoricalEvent", 
@@ -31,5 +33,11 @@ __all__ = [
     "GeonamesCity",
     "IntegrationDefinition",
     "UserIntegration",
-    "ContinentShape"
+    "ContinentShape",
+    "ContinentPiece",
+    "EventYearCount",
+    "EventDensityCell",
+    "EventDensityCentury",
+    "EventTombstone",
+    "EventDuplicateRemoved"
 ]
\ No newline at end of file
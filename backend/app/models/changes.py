@@ -0,0 +1,80 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, event, DDL, func
+from sqlalchemy.dialects.postgresql import JSONB
+from ..database import Base
+
+# Id (xid8) da transação atual como bigint: cresce a cada transação nova
+CHANGE_SEQ_SQL = "pg_current_xact_id()::text::bigint"
+
+# Marca d'água do feed: toda transação com id menor já terminou (commit ou rollback)
+CHANGE_WATERMARK_SQL = "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+class EventTombstone(Base):
+    """
+    Registro de um evento apagado, para o feed GET /events/changes avisar os
+    clientes. Gravado pelo trigger `events_tombstone` em todo DELETE de `events`.
+    """
+    __tablename__ = "event_tombstones"
+    __table_args__ = (
+        Index("ix_event_tombstones_change_seq", "change_seq", "event_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<Tombstone {self.event_id} @ {self.change_seq}>"
+
+
+class EventDuplicateRemoved(Base):
+    """
+    Cópia (linha inteira em JSON) de cada evento removido pela fusão de
+    duplicatas que antecede a criação do índice único da chave natural
+    (ver models/events.py). `kept_id` é o evento que ficou no lugar.
+    """
+    __tablename__ = "event_duplicates_removed"
+
+    id = Column(BigInteger, primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    kept_id = Column(Integer, nullable=False)
+    data = Column(JSONB, nullable=False)
+    removed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<DuplicateRemoved {self.event_id} -> {self.kept_id}>"
+
+
+# `events.change_seq` = id da última transação que inseriu/alterou a linha.
+# Bancos antigos ganham a coluna com 0 (anterior a qualquer cursor do feed).
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(f"""
+        ALTER TABLE events ADD COLUMN IF NOT EXISTS change_seq bigint NOT NULL DEFAULT 0;
+        CREATE INDEX IF NOT EXISTS ix_events_change_seq ON events (change_seq, id);
+
+        CREATE OR REPLACE FUNCTION events_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := {CHANGE_SEQ_SQL};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE TRIGGER events_change_seq
+        BEFORE INSERT OR UPDATE ON events
+        FOR EACH ROW EXECUTE FUNCTION events_change_seq();
+
+        CREATE OR REPLACE FUNCTION events_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO event_tombstones (event_id, change_seq) VALUES (OLD.id, {CHANGE_SEQ_SQL});
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE TRIGGER events_tombstone
+        AFTER DELETE ON events
+        FOR EACH ROW EXECUTE FUNCTION events_tombstone();
+    """)
+)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, Enum as SQLEnum, Index
+from sqlalchemy import BigInteger, Column, Computed, Float, Integer, String, Text, Enum as SQLEnum, Index, event, DDL, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from geoalchemy2 import Geometry
 from enum import Enum
 from ..database import Base
@@ -9,6 +11,56 @@ class EventSource(str, Enum):
     SEED = "seed"
     KAGGLE = "kaggle"
 
+# Documento de busca textual: nome (peso A), descrição (B) e conteúdo (C),
+# indexados tanto em português quanto em inglês (Kaggle e parte da Wikidata vêm em inglês)
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('portuguese', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('portuguese', coalesce(content, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'C')
+"""
+
+# Chave natural de deduplicação: nome sem caixa e com espaços normalizados.
+# Usada na coluna gerada `name_key` e em SQL cru sobre tabelas com coluna `name`.
+NAME_KEY_SQL = "lower(btrim(regexp_replace(name, '\\s+', ' ', 'g')))"
+
+# Properties da Feature GeoJSON do mapa -> coluna, na ordem de saída.
+# Fonte única para FEATURE_PROPERTIES (EventService) e para a coluna `geojson_feature`.
+FEATURE_PROPERTY_COLUMNS = (
+    ("id", "id"),
+    ("name", "name"),
+    ("description", "description"),
+    ("content", "content"),
+    ("year", "year_start"),
+    ("year_end", "year_end"),
+    ("period", "period"),
+    ("continent", "continent"),
+    ("source", "source"),
+)
+
+# Mesma Feature (byte a byte) que EventService._feature_json gera com todas as properties
+FEATURE_SQL = (
+    "json_build_object('type', 'Feature', 'geometry', ST_AsGeoJSON(location)::json, "
+    "'properties', json_build_object("
+    + ", ".join(f"'{prop}', {column}" for prop, column in FEATURE_PROPERTY_COLUMNS)
+    + "))::text"
+)
+
+# Peso da fonte na importância (curadoria manual vale mais que importação em massa)
+IMPORTANCE_SOURCE_WEIGHTS = {"manual": 3.0, "wikidata": 2.0, "seed": 1.5, "kaggle": 1.0}
+
+# Importância = peso da fonte + ln do tamanho do conteúdo (meio peso) + ln dos sitelinks da Wikidata.
+# Os logaritmos achatam os extremos: 10x mais texto ou idiomas somam uma constante, não 10x.
+IMPORTANCE_SQL = (
+    "CASE source "
+    + " ".join(f"WHEN '{name}' THEN {weight}" for name, weight in IMPORTANCE_SOURCE_WEIGHTS.items())
+    + " ELSE 1.0 END"
+    + " + ln(1 + length(coalesce(content, ''))) / 2"
+    + " + ln(1 + greatest(coalesce(sitelinks, 0), 0))"
+)
+
 class HistoricalEvent(Base):
     """
     Modelo principal de evento histórico (Schema Public).
@@ -36,5 +88,207 @@ class HistoricalEvent(Base):
     
     # PostGIS Geometry
     location = Column(Geometry('POINT', srid=4326, spatial_index=True), nullable=False)
+
+    # Chave natural (name_key, year_start, external_id), única via ux_events_natural_key.
+    # external_id vazio = sem escopo de fonte; preenchido (ex: QID da Wikidata) separa homônimos.
+    name_key = Column(String(500), Computed(NAME_KEY_SQL, persisted=True))
+    external_id = Column(String(100), nullable=False, default="", server_default="")
+
+    # Quantidade de Wikipédias com artigo sobre o item (só eventos da Wikidata)
+    sitelinks = Column(Integer, nullable=True)
+    # Relevância para amostragem do mapa (GET /events?max_features=); mantida pelo trigger events_importance
+    importance = Column(Float, nullable=False, default=0, server_default="0")
+
+    # Feature GeoJSON pronta (texto), mantida pelo trigger events_geojson_feature;
+    # o GET /events só concatena estes fragmentos (não é carregada por padrão)
+    geojson_feature = deferred(Column(Text, nullable=True))
+
+    # Id da última transação que gravou a linha (trigger events_change_seq, ver models/changes.py)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    # Coluna gerada pelo Postgres para a busca full-text (não é carregada por padrão)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
     def __repr__(self) -> str:
-        return f"<Event {self.id}: {self.name}>"
\ No newline at end of file
+        return f"<Event {self.id}: {self.name}>"
+
+    @classmethod
+    def year_span(cls):
+        """
+        Intervalo fechado [year_start, year_end] do evento como int4range.
+        year_end nulo (ou menor que o início) vira evento pontual.
+        Precisa ser idêntico à expressão de ix_events_year_span para o índice ser usado.
+        """
+        return func.int4range(
+            cls.year_start,
+            func.greatest(cls.year_start, func.coalesce(cls.year_end, cls.year_start)),
+            literal_column("'[]'")
+        )
+
+    @classmethod
+    def natural_key(cls):
+        """Colunas do índice único ux_events_natural_key (alvo dos ON CONFLICT)."""
+        return [cls.name_key, cls.year_start, cls.external_id]
+
+    @staticmethod
+    def normalize_name(value):
+        """Mesma normalização de `name_key`, aplicada a um valor/expressão qualquer."""
+        return func.lower(func.btrim(func.regexp_replace(value, literal_column("'\\s+'"), " ", "g")))
+
+
+# btree_gist permite misturar colunas escalares (continent) num índice GiST;
+# pg_trgm dá a busca tolerante a erros de digitação
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+# O create_all não altera tabelas que já existem, então os índices adicionados
+# depois da criação de `events` são garantidos aqui (idempotente, roda a cada startup).
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Paginação keyset de /events/all: ORDER BY (year_start, id)
+    DDL("CREATE INDEX IF NOT EXISTS ix_events_year_start_id ON events (year_start, id)")
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Janela do mapa: sobreposição de intervalos (&&) + continente + viewport num só índice GiST
+    DDL("""
+        CREATE INDEX IF NOT EXISTS ix_events_year_span ON events USING gist (
+            int4range(year_start, GREATEST(year_start, COALESCE(year_end, year_start)), '[]'),
+            continent,
+            location
+        )
+    """)
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Busca (/events/search): coluna tsvector em bancos antigos + índices GIN
+    DDL(f"""
+        ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED;
+        CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING gin (search_vector);
+        CREATE INDEX IF NOT EXISTS ix_events_name_trgm ON events USING gin (name gin_trgm_ops);
+    """)
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Chave natural: colunas em bancos antigos; antes do índice único, as duplicatas
+    # existentes são fundidas (fica o manual, depois o de conteúdo mais longo).
+    # As removidas são copiadas para `event_duplicates_removed` e a contagem
+    # sai como WARNING no log do Postgres.
+    DDL(f"""
+        ALTER TABLE events ADD COLUMN IF NOT EXISTS name_key varchar(500)
+            GENERATED ALWAYS AS ({NAME_KEY_SQL}) STORED;
+        ALTER TABLE events ADD COLUMN IF NOT EXISTS external_id varchar(100) NOT NULL DEFAULT '';
+
+        DO $$
+        DECLARE
+            removed integer;
+        BEGIN
+            IF to_regclass('ux_events_natural_key') IS NULL THEN
+                WITH ranked AS (
+                    SELECT id,
+                           row_number() OVER w AS rn,
+                           first_value(id) OVER w AS kept_id
+                    FROM events
+                    WINDOW w AS (
+                        PARTITION BY name_key, year_start, external_id
+                        ORDER BY (source = 'manual') DESC, length(coalesce(content, '')) DESC, id
+                    )
+                ), moved AS (
+                    DELETE FROM events e USING ranked d
+                    WHERE e.id = d.id AND d.rn > 1
+                    RETURNING e.id, d.kept_id, to_jsonb(e) AS data
+                )
+                INSERT INTO event_duplicates_removed (event_id, kept_id, data)
+                SELECT id, kept_id, data FROM moved;
+
+                GET DIAGNOSTICS removed = ROW_COUNT;
+                IF removed > 0 THEN
+                    RAISE WARNING '%% eventos duplicados removidos pela chave natural (cópias em event_duplicates_removed)', removed;
+                END IF;
+
+                CREATE UNIQUE INDEX ux_events_natural_key ON events (name_key, year_start, external_id);
+            END IF;
+        END $$;
+    """)
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Importância: função única usada pelo trigger e pela carga inicial de bancos antigos
+    DDL(f"""
+        CREATE OR REPLACE FUNCTION event_importance(source text, content text, sitelinks integer)
+        RETURNS double precision AS $$
+            SELECT ({IMPORTANCE_SQL})::double precision
+        $$ LANGUAGE sql IMMUTABLE;
+
+        ALTER TABLE events ADD COLUMN IF NOT EXISTS sitelinks integer;
+
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'events' AND column_name = 'importance'
+            ) THEN
+                ALTER TABLE events ADD COLUMN importance double precision NOT NULL DEFAULT 0;
+                UPDATE events SET importance = event_importance(source::text, content, sitelinks);
+            END IF;
+        END $$;
+
+        CREATE OR REPLACE FUNCTION events_importance() RETURNS trigger AS $$
+        BEGIN
+            NEW.importance := event_importance(NEW.source::text, NEW.content, NEW.sitelinks);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE TRIGGER events_importance
+        BEFORE INSERT OR UPDATE OF source, content, sitelinks ON events
+        FOR EACH ROW EXECUTE FUNCTION events_importance();
+
+        CREATE INDEX IF NOT EXISTS ix_events_importance ON events (importance DESC, id);
+    """)
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    # Feature pré-serializada: carga inicial só quando a coluna é criada (bancos antigos).
+    # O nome do trigger importa: BEFORE triggers rodam em ordem alfabética, e este
+    # precisa vir depois de events_fill_continent, que pode trocar o continente.
+    DDL(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'events' AND column_name = 'geojson_feature'
+            ) THEN
+                ALTER TABLE events ADD COLUMN geojson_feature text;
+                UPDATE events SET geojson_feature = {FEATURE_SQL};
+            END IF;
+        END $$;
+
+        CREATE OR REPLACE FUNCTION events_geojson_feature() RETURNS trigger AS $$
+        BEGIN
+            NEW.geojson_feature := (SELECT {FEATURE_SQL} FROM (SELECT NEW.*) AS row_);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE TRIGGER events_geojson_feature
+        BEFORE INSERT OR UPDATE OF {", ".join(c for _, c in FEATURE_PROPERTY_COLUMNS if c != "id")}, location
+        ON events
+        FOR EACH ROW EXECUTE FUNCTION events_geojson_feature();
+    """)
+)
@@ -1,8 +1,11 @@
 # projeto/app/models/spatial.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, event, DDL
 from geoalchemy2 import Geometry
+from ..config import get_settings
 from ..database import Base
 
+settings = get_settings()
+
 class ContinentShape(Base):
     __tablename__ = "continents_shapes"
     __table_args__ = {"schema": "settings"} # Vamos guardar em settings por ser um dado de referência
@@ -10,4 +13,64 @@ class ContinentShape(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
     # MULTIPOLYGON para aceitar o formato do JSON
-    geom = Column(Geometry('MULTIPOLYGON', srid=4326), nullable=False)
\ No newline at end of file
+    geom = Column(Geometry('MULTIPOLYGON', srid=4326), nullable=False)
+
+
+class ContinentPiece(Base):
+    """
+    Pedaços dos polígonos de `continents_shapes` (ST_Subdivide), derivados por
+    ContinentService.refresh_pieces. Cada ST_Intersects testa só um pedaço
+    pequeno em vez do contorno inteiro do continente.
+    """
+    __tablename__ = "continents_subdivided"
+    __table_args__ = {"schema": "settings"}
+
+    id = Column(Integer, primary_key=True)
+    # id do ContinentShape de origem: em fronteiras vale o de menor id (como no índice em memória)
+    shape_id = Column(Integer, nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    # GiST criado pelo geoalchemy2 (spatial_index=True por padrão)
+    geom = Column(Geometry('POLYGON', srid=4326), nullable=False)
+
+
+# Preenche o continente de linhas inseridas sem ele (ou com rótulo de falha),
+# usando os pedaços subdivididos. Só troca o valor quando algum pedaço casa.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION events_fill_continent() RETURNS trigger AS $$
+        DECLARE
+            detected varchar(100);
+        BEGIN
+            SELECT p.name INTO detected
+            FROM settings.continents_subdivided p
+            WHERE ST_Intersects(p.geom, NEW.location)
+            ORDER BY p.shape_id
+            LIMIT 1;
+
+            IF detected IS NOT NULL THEN
+                NEW.continent := detected;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+)
+
+# O trigger é opcional (CONTINENT_TRIGGER_ENABLED): a API já detecta antes de gravar
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE TRIGGER events_fill_continent
+        BEFORE INSERT OR UPDATE OF location ON events
+        FOR EACH ROW
+        WHEN (NEW.location IS NOT NULL AND (
+            NEW.continent IS NULL OR NEW.continent IN ('Desconhecido', 'Erro na Detecção', 'Outro')
+        ))
+        EXECUTE FUNCTION events_fill_continent();
+    """ if settings.continent_trigger_enabled else """
+        DROP TRIGGER IF EXISTS events_fill_continent ON events;
+    """)
+)
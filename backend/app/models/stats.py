@@ -0,0 +1,182 @@
+from sqlalchemy import Boolean, Column, Integer, String, event, DDL
+from ..database import Base
+
+
+class EventYearCount(Base):
+    """
+    Resumo pré-agregado de `events`: quantos eventos começam em cada ano,
+    por continente e fonte. Alimenta o histograma da linha do tempo sem
+    varrer a tabela principal. Mantido pelos triggers `events_year_counts_sync_*`.
+    """
+    __tablename__ = "event_year_counts"
+
+    year = Column(Integer, primary_key=True)
+    # Chave primária não aceita NULL: continente/fonte ausentes viram ''
+    continent = Column(String(100), primary_key=True, default="")
+    source = Column(String(20), primary_key=True, default="")
+    total = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<YearCount {self.year} {self.continent}/{self.source}: {self.total}>"
+
+
+# Carga inicial: só roda quando o resumo está vazio (tabela recém-criada em banco existente)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("""
+        INSERT INTO event_year_counts (year, continent, source, total)
+        SELECT year_start, COALESCE(continent, ''), COALESCE(source::text, ''), count(*)
+        FROM events
+        WHERE NOT EXISTS (SELECT 1 FROM event_year_counts)
+        GROUP BY 1, 2, 3
+    """)
+)
+
+# Toda escrita em `events` (API, ETL, SQL direto) ajusta o resumo na mesma transação.
+# Triggers por comando (transition tables): o saldo de cada (ano, continente, fonte)
+# é somado por comando, então um COPY/lote de 5000 linhas gera um único upsert
+# e as linhas quentes do resumo ficam travadas por um comando, não por linha.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION events_year_counts_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO event_year_counts (year, continent, source, total)
+                SELECT year_start, COALESCE(continent, ''), COALESCE(source::text, ''), count(*)
+                FROM new_rows
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (year, continent, source)
+                DO UPDATE SET total = event_year_counts.total + EXCLUDED.total;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE event_year_counts c SET total = c.total - d.total
+                FROM (
+                    SELECT year_start AS year, COALESCE(continent, '') AS continent,
+                           COALESCE(source::text, '') AS source, count(*) AS total
+                    FROM old_rows
+                    GROUP BY 1, 2, 3
+                ) d
+                WHERE c.year = d.year AND c.continent = d.continent AND c.source = d.source;
+            ELSE
+                INSERT INTO event_year_counts (year, continent, source, total)
+                SELECT year, continent, source, sum(delta)
+                FROM (
+                    SELECT year_start AS year, COALESCE(continent, '') AS continent,
+                           COALESCE(source::text, '') AS source, 1 AS delta
+                    FROM new_rows
+                    UNION ALL
+                    SELECT year_start, COALESCE(continent, ''), COALESCE(source::text, ''), -1
+                    FROM old_rows
+                ) d
+                GROUP BY 1, 2, 3
+                HAVING sum(delta) <> 0
+                ORDER BY 1, 2, 3
+                ON CONFLICT (year, continent, source)
+                DO UPDATE SET total = event_year_counts.total + EXCLUDED.total;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        -- Versão anterior era FOR EACH ROW
+        DROP TRIGGER IF EXISTS events_year_counts_sync ON events;
+
+        CREATE OR REPLACE TRIGGER events_year_counts_sync_insert
+        AFTER INSERT ON events REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_year_counts_sync();
+
+        -- Transition tables não aceitam `UPDATE OF colunas`: linhas sem mudança
+        -- de ano/continente/fonte se anulam no saldo (HAVING sum <> 0)
+        CREATE OR REPLACE TRIGGER events_year_counts_sync_update
+        AFTER UPDATE ON events REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_year_counts_sync();
+
+        CREATE OR REPLACE TRIGGER events_year_counts_sync_delete
+        AFTER DELETE ON events REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_year_counts_sync();
+    """)
+)
+
+
+class EventDensityCell(Base):
+    """
+    Resumo pré-agregado do mapa de densidade (GET /events/density): eventos por
+    célula (i, j) de ST_HexagonGrid/ST_SquareGrid em Web Mercator, por formato,
+    resolução, século (pelo ano de início) e continente. Reconstruído por
+    DensityService.rebuild; a geometria sai de ST_Hexagon/ST_Square(i, j).
+    """
+    __tablename__ = "event_density_cells"
+
+    shape = Column(String(10), primary_key=True)  # hex, square
+    resolution = Column(Integer, primary_key=True)  # índice em DENSITY_CELL_SIZES_M
+    century = Column(Integer, primary_key=True)  # floor(year_start / 100)
+    continent = Column(String(100), primary_key=True, default="")
+    i = Column(Integer, primary_key=True)
+    j = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DensityCell {self.shape}/{self.resolution} c{self.century} ({self.i}, {self.j}): {self.total}>"
+
+
+class EventDensityCentury(Base):
+    """
+    Situação de cada século no resumo de densidade. Só séculos presentes e com
+    `dirty` falso são lidos de `event_density_cells`; os demais (nunca agregados
+    ou alterados desde a última reconstrução) são contados direto de `events`.
+    """
+    __tablename__ = "event_density_centuries"
+
+    century = Column(Integer, primary_key=True)
+    dirty = Column(Boolean, nullable=False, default=True)
+
+    def __repr__(self) -> str:
+        return f"<DensityCentury {self.century}: {'dirty' if self.dirty else 'ok'}>"
+
+
+# Toda escrita em `events` que muda ano, ponto ou continente marca os séculos afetados.
+# Triggers por comando (transition tables): um INSERT de 10 mil linhas gera um único upsert.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION events_density_dirty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO event_density_centuries (century, dirty)
+                SELECT DISTINCT floor(year_start / 100.0)::int, true FROM new_rows
+                ON CONFLICT (century) DO UPDATE SET dirty = true WHERE NOT event_density_centuries.dirty;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO event_density_centuries (century, dirty)
+                SELECT DISTINCT floor(year_start / 100.0)::int, true FROM old_rows
+                ON CONFLICT (century) DO UPDATE SET dirty = true WHERE NOT event_density_centuries.dirty;
+            ELSE
+                INSERT INTO event_density_centuries (century, dirty)
+                SELECT DISTINCT floor(c.year_start / 100.0)::int, true
+                FROM new_rows n
+                JOIN old_rows o ON o.id = n.id
+                CROSS JOIN LATERAL (VALUES (n.year_start), (o.year_start)) AS c (year_start)
+                WHERE (n.year_start, n.continent) IS DISTINCT FROM (o.year_start, o.continent)
+                   OR NOT ST_Equals(n.location, o.location)
+                ON CONFLICT (century) DO UPDATE SET dirty = true WHERE NOT event_density_centuries.dirty;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE TRIGGER events_density_dirty_insert
+        AFTER INSERT ON events REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_density_dirty();
+
+        CREATE OR REPLACE TRIGGER events_density_dirty_update
+        AFTER UPDATE ON events REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_density_dirty();
+
+        CREATE OR REPLACE TRIGGER events_density_dirty_delete
+        AFTER DELETE ON events REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION events_density_dirty();
+    """)
+)
@@ -6,6 +6,8 @@ from typing import Dict, Any
 from ..database import get_db, SessionLocal
 from ..models import IntegrationDefinition, UserIntegration
 from ..services.task_manager import task_manager
+from ..services.response_cache import response_cache
+from ..services.density_service import run_density_rebuild
 from ..etl.registry import get_adapter # <--- O segredo
 
 router = APIRouter(prefix="/etl", tags=["etl"])
@@ -59,8 +61,13 @@ def _background_etl_runner(task_id: str, slug: str, params: Dict[str, Any]):
         task_manager.log(task_id, f"❌ Erro: {str(e)}")
         print(f"Erro ETL {slug}: {e}")
     finally:
+        # Mesmo cancelado ou com erro, o adaptador pode ter gravado eventos
+        response_cache.bump_version()
         db.close()
 
+    # Reagrega os séculos que o job sujou (tarefa própria no task_manager)
+    run_density_rebuild()
+
 @router.post("/run")
 def trigger_etl(req: RunEtlRequest, bg_tasks: BackgroundTasks):
     """
@@ -1,24 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import json
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Callable, Iterator, Optional, List, Tuple, Union
+from pydantic import BaseModel, ValidationError
 
-from ..database import get_db
-from ..models.events import HistoricalEvent
+from ..database import get_db, SessionLocal
+from ..config import get_settings
 from ..schemas import (
     EventCreate, 
     EventResponse, 
     EventGeoCollection, 
+    EventChangesPage,
+    EventNearResult,
+    EventSearchPage,
+    EventSourceEnum,
+    EventBulkUpdate,
+    BulkIngestResponse,
+    BulkMutationResponse,
     StatusResponse
 )
-from ..services.event_service import EventService
+from ..services.event_service import EventService, CLUSTER_MAX_ZOOM
+from ..services.bulk_service import BulkEventService
+from ..services.response_cache import response_cache, CachedResponse
+from ..services.timeline_service import TimelineService
+from ..services.density_service import DensityService, DENSITY_CELL_SIZES_M, DENSITY_SHAPES, run_density_rebuild
+from ..utils.helpers import encode_cursor, decode_cursor, decode_change_cursor
+from ..utils.spatial import detect_continents, parse_bbox
+from ..utils.formats import negotiate_format, ensure_available, encode_columns, media_type_for
+
+settings = get_settings()
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+def _stream_events(produce, service_class=EventService):
+    """
+    Executa um gerador de um serviço (EventService por padrão) com sessão própria:
+    o stream continua depois que a rota retorna, então não pode depender da sessão do get_db.
+    """
+    db = SessionLocal()
+    try:
+        yield from produce(service_class(db))
+    finally:
+        db.close()
+
+
+def _json_body(content) -> bytes:
+    """Serializa como o FastAPI faria, para guardar no cache."""
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def _cache_lookup(request: Request, variant: str, cache_control: str):
+    """
+    Chave/headers da rota no cache versionado (ver ResponseCache) e a resposta
+    pronta quando dá para servir sem tocar no banco (304 ou entrada em cache).
+    A chave é a rota + query string; o ETag muda junto com a versão dos dados.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = response_cache.make_key(request.url.path, query, variant)
+    etag = response_cache.etag(key)
+    # Vary: Accept porque /events e /events/all também negociam o formato pelo Accept
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return key, headers, Response(status_code=304, headers=headers)
+
+    entry = response_cache.get(key)
+    if entry is not None:
+        return key, headers, _cached_response(entry, headers)
+    return key, headers, None
+
+
+def _cached_response(entry: CachedResponse, headers: dict) -> Response:
+    return Response(entry.body, media_type=entry.media_type, headers={**entry.headers, **headers})
+
+
+def _cached(
+    request: Request,
+    build: Callable[[], Union[CachedResponse, Iterator[bytes]]],
+    media_type: str,
+    variant: str = "",
+    cache_control: str = "no-cache"
+) -> Response:
+    """
+    Serve uma rota de leitura pelo cache versionado; If-None-Match vira 304.
+    `build` devolve um CachedResponse pronto ou um gerador de bytes (repassado em streaming).
+    """
+    key, headers, hit = _cache_lookup(request, variant, cache_control)
+    if hit is not None:
+        return hit
+
+    result = build()
+    if not isinstance(result, CachedResponse):
+        return StreamingResponse(response_cache.tee(key, result, media_type), media_type=media_type, headers=headers)
+
+    response_cache.put(key, result)
+    return _cached_response(result, headers)
+
+
+def _map_format(request: Request, format: Optional[str]) -> str:
+    """Formato do GET /events; 406 se o binário pedido não tiver a lib instalada."""
+    fmt = negotiate_format(request.headers.get("accept", ""), format)
+    try:
+        ensure_available(fmt)
+    except ImportError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    return fmt
+
+
 # --- Schema Local para a Resposta de Detecção ---
 class ContinentDetectionResponse(BaseModel):
     continent: str
 
+class ContinentBatchResponse(BaseModel):
+    continents: List[Optional[str]]
+    errors: int = 0
+
 @router.get("/detect-continent", response_model=ContinentDetectionResponse)
 def detect_continent_route(
     lat: float, 
@@ -34,23 +134,164 @@ def detect_continent_route(
     return {"continent": detected}
 
 
+@router.post("/detect-continent/batch", response_model=ContinentBatchResponse)
+async def detect_continent_batch(request: Request, db: Session = Depends(get_db)):
+    """
+    Continente de muitos pontos numa requisição só. Aceita um array JSON ou NDJSON
+    de {"lat": .., "lon": ..} ou [lat, lon]. `continents` vem na ordem de entrada;
+    pontos inválidos ficam null e são contados em `errors`.
+    """
+    points = []
+    async for _, item in _iter_json_items(request):
+        points.append(_parse_point(item))
+        if len(points) > settings.detect_batch_max_points:
+            raise HTTPException(status_code=413, detail=f"Máximo de {settings.detect_batch_max_points} pontos por requisição")
+
+    valid = [i for i, p in enumerate(points) if p is not None]
+    detected = await run_in_threadpool(
+        detect_continents, db, [points[i][0] for i in valid], [points[i][1] for i in valid]
+    )
+
+    continents = [None] * len(points)
+    for i, name in zip(valid, detected):
+        continents[i] = name
+    return ContinentBatchResponse(continents=continents, errors=len(points) - len(valid))
+
+
+def _parse_point(item) -> Optional[Tuple[float, float]]:
+    """{"lat", "lon"} ou [lat, lon] -> (lat, lon); None se faltar valor ou estiver fora do globo."""
+    try:
+        if isinstance(item, dict):
+            lat, lon = float(item["lat"]), float(item["lon"])
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            lat, lon = float(item[0]), float(item[1])
+        else:
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
 @router.get("", response_model=EventGeoCollection)
 def get_events(
+    request: Request,
     start_year: int = Query(..., ge=-10000, le=2100),
     end_year: int = Query(..., ge=-10000, le=2100),
     continent: Optional[str] = None,
+    bbox: Optional[str] = Query(None, description="Viewport: min_lon,min_lat,max_lon,max_lat"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Zoom do mapa; abaixo de 12 retorna clusters"),
+    max_features: Optional[int] = Query(
+        None, ge=1, le=1000, description="Só os N eventos mais importantes por célula do zoom (em vez de clusters)"
+    ),
+    fields: Optional[str] = Query(None, description="Properties desejadas, ex: name,year,continent"),
+    profile: Optional[str] = Query(None, description="'map' = apenas id, name e year"),
+    format: Optional[str] = Query(None, description="geojson (padrão), arrow ou msgpack; também via Accept"),
     db: Session = Depends(get_db)
 ):
-    """Retorna eventos filtrados como GeoJSON para o Mapa."""
-    service = EventService(db)
-    return service.get_filtered(start_year, end_year, continent)
+    """
+    Retorna eventos filtrados como GeoJSON para o Mapa.
+    Com `bbox` só devolve o que está visível; com `zoom` baixo devolve clusters
+    calculados no PostGIS (properties.cluster / properties.point_count).
+    Os pontos individuais são gerados como JSON pelo próprio Postgres e enviados em streaming;
+    `fields`/`profile` cortam as colunas no SELECT (o conteúdo completo fica em GET /events/{id}).
+    Formatos binários colunares (Arrow IPC / MessagePack) via `format` ou Accept.
+    Com `max_features` o mapa recebe pontos amostrados por importância (no máximo N
+    por célula do zoom, os mais relevantes primeiro) em vez de clusters.
+    """
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+        selected = EventService.resolve_fields(fields, profile)
+        fmt = _map_format(request, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if fmt != "geojson":
+        def build_binary():
+            columns = EventService(db).get_columns(
+                start_year, end_year, continent, bounds, selected, zoom, max_features
+            )
+            return CachedResponse(encode_columns(columns, fmt), media_type_for(fmt))
+
+        return _cached(request, build_binary, media_type_for(fmt), variant=fmt)
+
+    def build():
+        if max_features is None and zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            clusters = EventService(db).get_filtered(start_year, end_year, continent, bounds, zoom)
+            return CachedResponse(clusters.model_dump_json().encode("utf-8"), "application/geo+json")
+        return _stream_events(
+            lambda service: service.stream_filtered(start_year, end_year, continent, bounds, selected, zoom, max_features)
+        )
+
+    return _cached(request, build, "application/geo+json")
+
+
+@router.get("/tiles/{z}/{x}/{y}.pbf")
+def get_event_tile(
+    request: Request,
+    z: int,
+    x: int,
+    y: int,
+    start_year: int = Query(..., ge=-10000, le=2100),
+    end_year: int = Query(..., ge=-10000, le=2100),
+    continent: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Vector Tile (MVT) dos eventos, camada 'events'.
+    Cada combinação de (z, x, y, filtros) é uma URL própria, então o tile pode ser
+    cacheado pelo navegador/CDN e o mapa só carrega o que está visível.
+    """
+    if not 0 <= z <= 22 or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Coordenadas de tile inválidas")
+
+    def build():
+        tile = EventService(db).get_tile(z, x, y, start_year, end_year, continent)
+        return CachedResponse(tile, "application/vnd.mapbox-vector-tile")
+
+    return _cached(
+        request, build, "application/vnd.mapbox-vector-tile",
+        cache_control="public, max-age=300"
+    )
 
 
 @router.get("/all", response_model=List[EventResponse])
-def get_all_events(db: Session = Depends(get_db)):
-    """Retorna todos os eventos em formato de lista (para a ListView)."""
-    service = EventService(db)
-    return service.get_all()
+def get_all_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    format: Optional[str] = Query(None, description="'ndjson' para streaming linha a linha"),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna os eventos em formato de lista (para a ListView), ordenados por (ano, id).
+    - `limit` (+ `cursor`): paginação keyset; o cursor da próxima página vem no header X-Next-Cursor.
+    - `format=ndjson` (ou Accept: application/x-ndjson): streaming com memória constante.
+    """
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        return _cached(
+            request,
+            lambda: _stream_events(lambda service: service.stream_all(position)),
+            "application/x-ndjson",
+            variant="ndjson"
+        )
+
+    def build():
+        events = EventService(db).get_all(limit, position)
+        headers = {}
+        if limit and len(events) == limit:
+            last = events[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.year_start, last.id)
+        return CachedResponse(_json_body(events), "application/json", headers)
+
+    return _cached(request, build, "application/json")
 
 
 @router.post("", response_model=StatusResponse)
@@ -61,6 +302,139 @@ def create_event(event: EventCreate, db: Session = Depends(get_db)):
     return StatusResponse(**result)
 
 
+@router.post("/bulk", response_model=BulkIngestResponse)
+async def create_events_bulk(request: Request, bg_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Ingestão em lote. Aceita um array JSON ou NDJSON (Content-Type: application/x-ndjson),
+    lido em streaming. Cada lote de BULK_BATCH_SIZE linhas vira um COPY + upsert set-based
+    numa transação. `results` traz o status de cada linha na ordem de entrada.
+    Depois da resposta, o resumo do mapa de densidade é reagregado em background.
+    """
+    service = BulkEventService(db)
+    results = []
+    batch = []
+
+    async def flush():
+        if batch:
+            results.extend(await run_in_threadpool(service.ingest, list(batch)))
+            batch.clear()
+
+    async def accept(index: int, payload):
+        if payload is None:
+            results.append({"index": index, "status": "error", "detail": "JSON inválido"})
+            return
+        try:
+            batch.append((index, EventCreate.model_validate(payload)))
+        except ValidationError as e:
+            detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            results.append({"index": index, "status": "error", "detail": detail})
+            return
+        if len(batch) >= settings.bulk_batch_size:
+            await flush()
+
+    async for index, item in _iter_json_items(request):
+        await accept(index, item)
+
+    await flush()
+    bg_tasks.add_task(run_density_rebuild)
+
+    results.sort(key=lambda r: r["index"])
+    summary = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
+    for r in results:
+        summary["errors" if r["status"] == "error" else r["status"]] += 1
+
+    return BulkIngestResponse(**summary, results=results)
+
+
+async def _iter_json_items(request: Request):
+    """
+    Itens (índice, objeto) de um corpo array JSON ou NDJSON (Content-Type:
+    application/x-ndjson). O NDJSON é lido em streaming; linha inválida vira None.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        index = 0
+        pending = b""
+        async for chunk in request.stream():
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield index, _parse_json_line(line)
+                    index += 1
+        if pending.strip():
+            yield index, _parse_json_line(pending)
+        return
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corpo deve ser um array JSON ou NDJSON")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Corpo deve ser um array JSON ou NDJSON")
+    for index, item in enumerate(payload):
+        yield index, item
+
+
+def _parse_json_line(line: bytes):
+    """Linha NDJSON -> objeto; None se não for JSON válido (vira status 'error')."""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _mutation_filters(
+    name: Optional[str] = Query(None, min_length=1, max_length=500),
+    source: Optional[EventSourceEnum] = None,
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    continent: Optional[str] = None
+) -> dict:
+    """Filtros do DELETE/PATCH em massa; exige ao menos um para não atingir a tabela inteira."""
+    filters = {
+        "name": name,
+        "source": source.value if source else None,
+        "start_year": start_year,
+        "end_year": end_year,
+        "continent": continent
+    }
+    if all(v is None for v in filters.values()):
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro (name, source, start_year, end_year, continent)")
+    return filters
+
+
+@router.delete("", response_model=BulkMutationResponse)
+def delete_events_matching(
+    bg_tasks: BackgroundTasks,
+    filters: dict = Depends(_mutation_filters),
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Deleta todos os eventos que casam com o filtro. `name` ignora caixa e espaços extras;
+    `start_year`/`end_year` limitam o ano de início. Com `dry_run=true` só conta.
+    """
+    if not dry_run:
+        bg_tasks.add_task(run_density_rebuild)
+    return BulkEventService(db).delete_matching(filters, dry_run)
+
+
+@router.patch("", response_model=BulkMutationResponse)
+def update_events_matching(
+    changes: EventBulkUpdate,
+    bg_tasks: BackgroundTasks,
+    filters: dict = Depends(_mutation_filters),
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Aplica os campos do corpo a todos os eventos do filtro (mesmos filtros do DELETE)."""
+    if not changes.model_fields_set:
+        raise HTTPException(status_code=400, detail="Nenhum campo para atualizar")
+    if not dry_run:
+        bg_tasks.add_task(run_density_rebuild)
+    return BulkEventService(db).update_matching(filters, changes, dry_run)
+
+
 @router.delete("/{event_id}", response_model=StatusResponse)
 def delete_event(event_id: int, db: Session = Depends(get_db)):
     """Deleta evento por ID."""
@@ -74,17 +448,206 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/filters")
-def get_unique_filters(db: Session = Depends(get_db)):
+def get_unique_filters(
+    request: Request,
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    db: Session = Depends(get_db)
+):
     """
     Busca no banco todos os valores únicos existentes (Continentes, Períodos, Fontes).
     Usado para preencher os Selects do Frontend dinamicamente.
+    `counts` traz quantos eventos há em cada valor (dentro da janela, se informada).
+    """
+    def build():
+        facets = EventService(db).get_facets(start_year, end_year)
+        return CachedResponse(_json_body(facets), "application/json")
+
+    return _cached(request, build, "application/json")
+
+
+@router.get("/histogram")
+def get_histogram(
+    request: Request,
+    bucket: int = Query(10, ge=1, le=1000, description="Tamanho da faixa em anos"),
+    continent: Optional[str] = None,
+    source: Optional[str] = None,
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    db: Session = Depends(get_db)
+):
+    """
+    Densidade de eventos ao longo do tempo para desenhar o slider.
+    Lido da tabela pré-agregada `event_year_counts`, sem varrer `events`.
+    """
+    def build():
+        histogram = TimelineService(db).histogram(bucket, continent, source, start_year, end_year)
+        return CachedResponse(_json_body(histogram), "application/json")
+
+    return _cached(request, build, "application/json")
+
+
+@router.get("/density")
+def get_density(
+    request: Request,
+    start_year: int = Query(..., ge=-10000, le=2100),
+    end_year: int = Query(..., ge=-10000, le=2100),
+    resolution: int = Query(
+        1, ge=0, le=len(DENSITY_CELL_SIZES_M) - 1,
+        description=f"Tamanho da célula: 0 = {DENSITY_CELL_SIZES_M[0] // 1000} km ... "
+                    f"{len(DENSITY_CELL_SIZES_M) - 1} = {DENSITY_CELL_SIZES_M[-1] // 1000} km"
+    ),
+    shape: str = Query("hex", description="hex ou square"),
+    continent: Optional[str] = None
+):
+    """
+    Mapa de densidade para o heatmap: eventos (pelo ano de início) agregados em
+    células hexagonais/quadradas, como FeatureCollection de polígonos com `count`.
+    Séculos inteiros vêm do resumo pré-agregado; só as pontas parciais da janela
+    tocam `events`. A contagem é sempre exata, mas o desempenho depende do resumo
+    estar em dia: ele é reagregado no startup e ao fim de ETLs, ingestões e
+    mutações em lote (ou via POST /settings/density/rebuild); séculos alterados
+    desde então, inclusive por edições avulsas, são contados ao vivo em `events`.
+    """
+    if shape not in DENSITY_SHAPES:
+        raise HTTPException(status_code=400, detail=f"shape deve ser: {', '.join(DENSITY_SHAPES)}")
+    if start_year > end_year:
+        raise HTTPException(status_code=400, detail="start_year deve ser <= end_year")
+
+    def build():
+        return _stream_events(
+            lambda service: service.stream_density(start_year, end_year, resolution, shape, continent),
+            DensityService
+        )
+
+    return _cached(request, build, "application/geo+json")
+
+
+@router.get("/search", response_model=EventSearchPage)
+def search_events(
+    q: str = Query(..., min_length=2, max_length=200),
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    continent: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Busca full-text (português e inglês) com tolerância a erros de digitação.
+    Aceita a sintaxe de buscador: "frase exata", -excluir, OR.
+    """
+    service = EventService(db)
+    return service.search(q, start_year, end_year, continent, limit, offset)
+
+
+@router.get("/near", response_model=List[EventNearResult])
+def get_events_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=settings.near_max_k),
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    continent: Optional[str] = None,
+    geodesic: bool = Query(False, description="Ordena pela distância no esferoide (mais preciso, um pouco mais lento)"),
+    db: Session = Depends(get_db)
+):
+    """
+    "O que aconteceu perto daqui": os `k` eventos mais próximos do ponto,
+    opcionalmente restritos à janela de anos e ao continente.
+    Cada item traz `distance_m` (metros).
+    """
+    def build():
+        events = EventService(db).near(lat, lon, k, start_year, end_year, continent, geodesic)
+        return CachedResponse(_json_body(events), "application/json")
+
+    return _cached(request, build, "application/json")
+
+
+@router.get("/playback")
+async def playback_events(
+    request: Request,
+    from_year: int = Query(..., alias="from", ge=-10000, le=2100),
+    to_year: int = Query(..., alias="to", ge=-10000, le=2100),
+    step: int = Query(10, ge=1, le=1000, description="Anos entre dois quadros"),
+    window: Optional[int] = Query(None, ge=1, le=10000, description="Largura da janela em anos (padrão: step)"),
+    continent: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Properties desejadas, ex: name,year,continent"),
+    profile: Optional[str] = Query(None, description="'map' = apenas id, name e year"),
+    interval_ms: int = Query(0, ge=0, le=10000, description="Pausa entre quadros (0 = o mais rápido possível)"),
+):
+    """
+    Reprodução animada da linha do tempo via Server-Sent Events (text/event-stream).
+    Cada quadro `step` traz `enter` (Features que entram na janela) e `leave`
+    (ids que saem); o último é `end`. Reconexões com Last-Event-ID continuam
+    do quadro seguinte, reenviando os ativos no primeiro `enter`.
+    """
+    try:
+        selected = EventService.resolve_fields(fields, profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if from_year > to_year:
+        raise HTTPException(status_code=400, detail="from deve ser <= to")
+    if (to_year - from_year) // step + 1 > settings.playback_max_steps:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {settings.playback_max_steps} quadros; aumente o step"
+        )
+
+    last_id = request.headers.get("last-event-id", "")
+    if last_id.lstrip("-").isdigit() and from_year <= int(last_id) <= to_year:
+        from_year = int(last_id) + step
+
+    async def stream():
+        frames = _stream_events(
+            lambda service: service.stream_playback(from_year, to_year, step, window, continent, selected)
+        )
+        try:
+            async for frame in iterate_in_threadpool(frames):
+                if await request.is_disconnected():
+                    break
+                yield frame
+                if interval_ms:
+                    await asyncio.sleep(interval_ms / 1000)
+        finally:
+            # Fecha a sessão mesmo se o cliente desconectar no meio de um trecho
+            await run_in_threadpool(frames.close)
+
+    # X-Accel-Buffering: proxies (nginx) repassam cada quadro sem acumular
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+
+@router.get("/changes", response_model=EventChangesPage)
+def get_event_changes(
+    response: Response,
+    since: Optional[str] = Query(None, description="next_since da chamada anterior; vazio devolve só o cursor atual"),
+    limit: int = Query(settings.changes_page_size, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Feed de mudanças para o cliente aplicar deltas em vez de recarregar a janela:
+    eventos inseridos/alterados (`upserts`) e ids apagados (`deleted`) desde `since`.
+    Com `has_more`, chame de novo com `next_since` até esgotar.
     """
-    continents = db.query(HistoricalEvent.continent).distinct().all()
-    periods = db.query(HistoricalEvent.period).distinct().all()
-    sources = db.query(HistoricalEvent.source).distinct().all()
+    try:
+        position = decode_change_cursor(since) if since else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["Cache-Control"] = "no-store"
+    return EventService(db).get_changes(position, limit)
+
+
+# Fica por último: "/{event_id}" casaria com /all, /filters etc. se viesse antes
+@router.get("/{event_id}", response_model=EventResponse)
+def get_event(event_id: int, db: Session = Depends(get_db)):
+    """Detalhe completo de um evento (inclui `content`), carregado sob demanda pelo popup."""
+    service = EventService(db)
+    event = service.get_by_id(event_id)
+
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
 
-    return {
-        "continents": sorted([c[0] for c in continents if c[0]]),
-        "periods": sorted([p[0] for p in periods if p[0]]),
-        "sources": sorted([s[0] for s in sources if s[0]])
-    }
\ No newline at end of file
+    return event
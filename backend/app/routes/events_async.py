@@ -0,0 +1,144 @@
+"""
+Versões assíncronas (asyncpg) das rotas de leitura mais acessadas de /events.
+Só é registrado pelo main.py quando o engine assíncrono existe (ASYNC_DB_ENABLED);
+por vir antes do router síncrono, estas rotas têm precedência sobre as de mesmo caminho.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Union
+
+from ..database import AsyncSessionLocal, get_async_db
+from ..schemas import EventResponse, EventGeoCollection
+from ..services.async_event_service import AsyncEventService
+from ..services.event_service import EventService, CLUSTER_MAX_ZOOM
+from ..services.response_cache import response_cache, CachedResponse
+from ..utils.helpers import encode_cursor, decode_cursor
+from ..utils.spatial import parse_bbox
+from ..utils.formats import encode_columns, media_type_for
+from .events import ContinentDetectionResponse, _cache_lookup, _cached_response, _json_body, _map_format
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+async def _stream_events(produce):
+    """Como o _stream_events síncrono: o stream abre a própria AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        async for chunk in produce(AsyncEventService(db)):
+            yield chunk
+
+
+async def _cached(
+    request: Request,
+    build: Callable[[], Awaitable[Union[CachedResponse, AsyncIterator[bytes]]]],
+    media_type: str,
+    variant: str = "",
+    cache_control: str = "no-cache"
+) -> Response:
+    """Mesmo cache versionado/ETag do router síncrono, com `build` assíncrono."""
+    key, headers, hit = _cache_lookup(request, variant, cache_control)
+    if hit is not None:
+        return hit
+
+    result = await build()
+    if not isinstance(result, CachedResponse):
+        return StreamingResponse(response_cache.atee(key, result, media_type), media_type=media_type, headers=headers)
+
+    response_cache.put(key, result)
+    return _cached_response(result, headers)
+
+
+@router.get("/detect-continent", response_model=ContinentDetectionResponse)
+async def detect_continent_route(lat: float, lon: float, db=Depends(get_async_db)):
+    """Endpoint leve para descobrir o continente baseado nas coordenadas."""
+    detected = await AsyncEventService(db).detect_continent(lat, lon)
+    return {"continent": detected}
+
+
+@router.get("", response_model=EventGeoCollection)
+async def get_events(
+    request: Request,
+    start_year: int = Query(..., ge=-10000, le=2100),
+    end_year: int = Query(..., ge=-10000, le=2100),
+    continent: Optional[str] = None,
+    bbox: Optional[str] = Query(None, description="Viewport: min_lon,min_lat,max_lon,max_lat"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Zoom do mapa; abaixo de 12 retorna clusters"),
+    max_features: Optional[int] = Query(
+        None, ge=1, le=1000, description="Só os N eventos mais importantes por célula do zoom (em vez de clusters)"
+    ),
+    fields: Optional[str] = Query(None, description="Properties desejadas, ex: name,year,continent"),
+    profile: Optional[str] = Query(None, description="'map' = apenas id, name e year"),
+    format: Optional[str] = Query(None, description="geojson (padrão), arrow ou msgpack; também via Accept"),
+    db=Depends(get_async_db)
+):
+    """Retorna eventos filtrados como GeoJSON para o Mapa (ver rota síncrona)."""
+    try:
+        bounds = parse_bbox(bbox) if bbox else None
+        selected = EventService.resolve_fields(fields, profile)
+        fmt = _map_format(request, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if fmt != "geojson":
+        async def build_binary():
+            columns = await AsyncEventService(db).get_columns(
+                start_year, end_year, continent, bounds, selected, zoom, max_features
+            )
+            return CachedResponse(encode_columns(columns, fmt), media_type_for(fmt))
+
+        return await _cached(request, build_binary, media_type_for(fmt), variant=fmt)
+
+    async def build():
+        if max_features is None and zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            clusters = await AsyncEventService(db).get_clusters(start_year, end_year, continent, bounds, zoom)
+            return CachedResponse(clusters.model_dump_json().encode("utf-8"), "application/geo+json")
+        return _stream_events(
+            lambda service: service.stream_filtered(start_year, end_year, continent, bounds, selected, zoom, max_features)
+        )
+
+    return await _cached(request, build, "application/geo+json")
+
+
+@router.get("/all", response_model=List[EventResponse])
+async def get_all_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    format: Optional[str] = Query(None, description="'ndjson' para streaming linha a linha"),
+    db=Depends(get_async_db)
+):
+    """Lista de eventos ordenada por (ano, id), com keyset e NDJSON (ver rota síncrona)."""
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        async def build_stream():
+            return _stream_events(lambda service: service.stream_all(position))
+
+        return await _cached(request, build_stream, "application/x-ndjson", variant="ndjson")
+
+    async def build():
+        events = await AsyncEventService(db).get_all(limit, position)
+        headers = {}
+        if limit and len(events) == limit:
+            last = events[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.year_start, last.id)
+        return CachedResponse(_json_body(events), "application/json", headers)
+
+    return await _cached(request, build, "application/json")
+
+
+@router.get("/filters")
+async def get_unique_filters(
+    request: Request,
+    start_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    end_year: Optional[int] = Query(None, ge=-10000, le=2100),
+    db=Depends(get_async_db)
+):
+    """Valores únicos e contagens de continente, período e fonte (ver rota síncrona)."""
+    async def build():
+        facets = await AsyncEventService(db).get_facets(start_year, end_year)
+        return CachedResponse(_json_body(facets), "application/json")
+
+    return await _cached(request, build, "application/json")
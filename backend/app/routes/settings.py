@@ -8,6 +8,8 @@ from ..models import IntegrationDefinition, UserIntegration, GeonamesCity
 from ..services.task_manager import task_manager
 from ..seeders.integrations import seed_integrations
 from ..etl.geonames.loader import sync_geonames_data
+from ..services.continent_service import ContinentService
+from ..services.density_service import run_density_rebuild
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -109,4 +111,33 @@ def sync_geonames(bg_tasks: BackgroundTasks):
             db.close()
             
     bg_tasks.add_task(run_sync, task_id)
-    return {"task_id": task_id, "status": "started"}
\ No newline at end of file
+    return {"task_id": task_id, "status": "started"}
+
+# --- Continentes ---
+
+@router.post("/continents/reclassify")
+def reclassify_continents(bg_tasks: BackgroundTasks, only_unresolved: bool = False):
+    """Recalcula o continente dos eventos no PostGIS (todos ou só os não resolvidos)."""
+    task_id = task_manager.create_task("Reclassificação de continentes")
+
+    def run_reclassify(tid: str):
+        db = SessionLocal()
+        try:
+            ContinentService(db).reclassify(tid, only_unresolved)
+        finally:
+            db.close()
+        # Trocar o continente muda as células por continente do resumo
+        run_density_rebuild()
+
+    bg_tasks.add_task(run_reclassify, task_id)
+    return {"task_id": task_id, "status": "started"}
+
+
+# --- Mapa de densidade ---
+
+@router.post("/density/rebuild")
+def rebuild_density(bg_tasks: BackgroundTasks, full: bool = False):
+    """Reagrega o resumo do mapa de densidade (séculos alterados, ou todos com `full`)."""
+    task_id = task_manager.create_task("Resumo do mapa de densidade")
+    bg_tasks.add_task(run_density_rebuild, task_id, full)
+    return {"task_id": task_id, "status": "started"}
@@ -27,6 +27,10 @@ class EventCreate(BaseModel):
     continent: Optional[str] = None
     period: Optional[str] = None
     source: EventSourceEnum = EventSourceEnum.manual
+    # Identificador na fonte de origem (ex: QID da Wikidata); separa homônimos do mesmo ano
+    external_id: Optional[str] = Field(None, max_length=100)
+    # Sitelinks do item na Wikidata (entra no cálculo de importância do evento)
+    sitelinks: Optional[int] = Field(None, ge=0)
 
     @field_validator('year_end')
     @classmethod
@@ -37,6 +41,15 @@ class EventCreate(BaseModel):
         return v
 
 
+class EventBulkUpdate(BaseModel):
+    """Campos aplicados a todos os eventos que casam com o filtro (PATCH /events)."""
+    description: Optional[str] = Field(None, max_length=1000)
+    content: Optional[str] = None
+    continent: Optional[str] = Field(None, max_length=100)
+    period: Optional[str] = Field(None, max_length=100)
+    source: Optional[EventSourceEnum] = None
+
+
 class PopulateOptions(BaseModel):
     """Schema para configuração de população."""
     mode: str = "fast"
@@ -74,6 +87,35 @@ class EventResponse(BaseModel):
         from_attributes = True
 
 
+class EventSearchResult(EventResponse):
+    """Evento encontrado pela busca, com a relevância calculada."""
+    rank: float
+
+
+class EventNearResult(EventResponse):
+    """Evento retornado pelo GET /events/near, com a distância até o ponto consultado."""
+    distance_m: float
+
+
+class EventSearchPage(BaseModel):
+    """Página de resultados da busca."""
+    items: List[EventSearchResult]
+    limit: int
+    offset: int
+    next_offset: Optional[int] = None
+
+
+class EventChangesPage(BaseModel):
+    """
+    Página do feed de mudanças: eventos inseridos/alterados e ids apagados
+    desde o cursor. `next_since` é o `since` da próxima chamada.
+    """
+    upserts: List[EventResponse]
+    deleted: List[int]
+    next_since: str
+    has_more: bool = False
+
+
 class EventGeoFeature(BaseModel):
     """Feature GeoJSON de um evento."""
     type: str = "Feature"
@@ -94,6 +136,31 @@ class StatusResponse(BaseModel):
     id: Optional[int] = None
 
 
+class BulkRowStatus(BaseModel):
+    """Resultado de uma linha da ingestão em lote."""
+    index: int
+    status: str  # created, updated, skipped, error
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkIngestResponse(BaseModel):
+    """Resumo da ingestão em lote (results na ordem de entrada)."""
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: int = 0
+    results: List[BulkRowStatus]
+
+
+class BulkMutationResponse(BaseModel):
+    """Resultado do DELETE/PATCH por filtro (`affected` fica 0 no dry_run)."""
+    status: str  # deleted, updated, dry_run
+    matched: int
+    affected: int = 0
+    batches: int = 0
+
+
 class PopulationStatus(BaseModel):
     """Status da população."""
     is_running: bool
@@ -3,6 +3,8 @@ import json
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from ..utils.continent_index import continent_index
+
 # URL do GeoJSON com os polígonos simplificados dos continentes
 URL = "https://gist.githubusercontent.com/hrbrmstr/91ea5cc9474286c72838/raw/59421ff9b268ff0929b051ddafafbeb94a4c1910/continents.json"
 
@@ -63,6 +65,7 @@ def seed_continents(db: Session):
             db.execute(sql, {"name": name_pt, "geom": geom_json})
         
         db.commit()
+        continent_index.invalidate()
         print(f"✅ Sucesso: {len(data['features'])} polígonos de continentes carregados e traduzidos.")
         
     except Exception as e:
@@ -1,9 +1,15 @@
 from .event_service import EventService
+from .async_event_service import AsyncEventService
 from .wikidata_service import WikidataService
 from .deduplicate_service import DeduplicateService
+from .timeline_service import TimelineService
+from .continent_service import ContinentService
 
 __all__ = [
     'EventService',
+    'AsyncEventService',
     'WikidataService',
-    'DeduplicateService'
+    'DeduplicateService',
+    'TimelineService',
+    'ContinentService'
 ]
\ No newline at end of file
@@ -0,0 +1,98 @@
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..schemas import EventResponse, EventGeoCollection
+from ..utils.spatial import get_continent_from_coords_async
+from .event_service import EventService, BBox, Cursor, CLUSTER_MAX_ZOOM, STREAM_BATCH_SIZE
+
+
+class AsyncEventService:
+    """
+    Versão assíncrona (AsyncSession + asyncpg) das leituras mais acessadas do mapa.
+    As consultas são as mesmas do EventService; só a execução muda.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[Cursor] = None
+    ) -> List[EventResponse]:
+        """Mesma página keyset de EventService.get_all (lat/lon vêm do PostGIS)."""
+        stmt = EventService._ndjson_query(cursor)
+        if limit:
+            stmt = stmt.limit(limit)
+
+        result = await self.db.execute(stmt)
+        return [EventResponse(**row._asdict()) for row in result]
+
+    async def stream_all(self, cursor: Optional[Cursor] = None) -> AsyncIterator[bytes]:
+        """NDJSON em lotes via cursor server-side do asyncpg."""
+        stmt = EventService._ndjson_query(cursor)
+        result = await self.db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        async for batch in result.partitions():
+            yield EventService._ndjson_batch(batch)
+
+    async def get_clusters(
+        self,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        zoom: int = 0
+    ) -> EventGeoCollection:
+        """Clusters de EventService.get_filtered (zoom abaixo de CLUSTER_MAX_ZOOM)."""
+        conditions = EventService._window_conditions(start_year, end_year, continent, bbox)
+        result = await self.db.execute(EventService._clusters_query(conditions, zoom))
+        return EventGeoCollection(features=[EventService._cluster_feature(row) for row in result])
+
+    async def stream_filtered(
+        self,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """FeatureCollection montado no Postgres, como em EventService.stream_filtered."""
+        stmt = EventService._features_query(start_year, end_year, continent, bbox, fields, zoom, max_features)
+        result = await self.db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        yield b'{"type":"FeatureCollection","features":['
+        separator = ""
+        async for batch in result.scalars().partitions():
+            yield (separator + ",".join(batch)).encode("utf-8")
+            separator = ","
+        yield b"]}"
+
+    async def get_columns(
+        self,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ) -> Dict[str, list]:
+        """Colunas de EventService.get_columns (formatos binários do mapa)."""
+        if max_features is None and zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            conditions = EventService._window_conditions(start_year, end_year, continent, bbox)
+            result = await self.db.execute(EventService._clusters_query(conditions, zoom))
+            return EventService._cluster_columns(result.all())
+
+        result = await self.db.execute(
+            EventService._columns_query(start_year, end_year, continent, bbox, fields, zoom, max_features)
+        )
+        return EventService._rows_to_columns(list(result.keys()), result.all())
+
+    async def get_facets(self, start_year: Optional[int] = None, end_year: Optional[int] = None) -> dict:
+        result = await self.db.execute(EventService._facets_query(start_year, end_year))
+        return EventService._facets_from_rows(result)
+
+    async def detect_continent(self, latitude: float, longitude: float) -> str:
+        return await get_continent_from_coords_async(self.db, latitude, longitude)
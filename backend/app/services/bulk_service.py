@@ -0,0 +1,279 @@
+import csv
+import io
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select, text, update
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..models import HistoricalEvent, EventSource
+from ..models.events import NAME_KEY_SQL
+from ..schemas import EventBulkUpdate, EventCreate
+from ..utils.helpers import calculate_period
+from ..utils.spatial import detect_continents
+from .response_cache import response_cache
+
+settings = get_settings()
+
+# Marcador de NULL no CSV do COPY (vazio continua sendo string vazia)
+COPY_NULL = "\\N"
+
+# Colunas carregadas via COPY na tabela temporária (mesma ordem do CSV)
+STAGING_COLUMNS = [
+    "ord", "name", "description", "content", "year_start", "year_end",
+    "continent", "period", "source", "external_id", "sitelinks", "lon", "lat"
+]
+
+
+class BulkEventService:
+    """
+    Ingestão de eventos em lote.
+    Cada lote entra por COPY numa tabela temporária e é resolvido com poucos
+    comandos set-based (duplicatas e um INSERT ... ON CONFLICT),
+    numa única transação, em vez de 3-4 idas ao banco e um commit por evento.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ingest(self, rows: List[Tuple[int, EventCreate]]) -> List[Dict]:
+        """
+        Grava um lote de (índice_original, evento) e devolve o status de cada um
+        (created / updated / skipped), na ordem de entrada.
+        Mesma regra do EventService.create: duplicata = mesma chave natural
+        (nome normalizado + ano + external_id); o existente só é atualizado se o
+        conteúdo novo for mais longo.
+        """
+        if not rows:
+            return []
+
+        try:
+            self._load_staging(rows)
+            self._apply()
+            statuses = self._collect_statuses(rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        response_cache.bump_version()
+        return statuses
+
+    def delete_matching(self, filters: Dict, dry_run: bool = False) -> Dict:
+        """
+        Remove todos os eventos que casam com o filtro (DELETE /events).
+        Roda em lotes de ids com um commit por lote, para não segurar locks
+        na tabela inteira durante deletes grandes.
+        """
+        conditions = self._filter_conditions(**filters)
+        matched = self._count(conditions)
+        if dry_run or not matched:
+            return {"status": "dry_run" if dry_run else "deleted", "matched": matched}
+
+        affected, batches = self._in_batches(
+            conditions, lambda ids: delete(HistoricalEvent).where(HistoricalEvent.id.in_(ids))
+        )
+        return {"status": "deleted", "matched": matched, "affected": affected, "batches": batches}
+
+    def update_matching(self, filters: Dict, changes: EventBulkUpdate, dry_run: bool = False) -> Dict:
+        """Aplica os mesmos campos a todos os eventos do filtro (PATCH /events), em lotes."""
+        values = changes.model_dump(exclude_unset=True)
+        if "source" in values and values["source"] is not None:
+            values["source"] = EventSource(values["source"])
+
+        conditions = self._filter_conditions(**filters)
+        matched = self._count(conditions)
+        if dry_run or not matched:
+            return {"status": "dry_run" if dry_run else "updated", "matched": matched}
+
+        affected, batches = self._in_batches(
+            conditions, lambda ids: update(HistoricalEvent).where(HistoricalEvent.id.in_(ids)).values(**values)
+        )
+        return {"status": "updated", "matched": matched, "affected": affected, "batches": batches}
+
+    # ========================================================================
+    # ETAPAS
+    # ========================================================================
+
+    def _load_staging(self, rows: List[Tuple[int, EventCreate]]):
+        self.db.execute(text(f"""
+            CREATE TEMP TABLE bulk_events_staging (
+                ord integer PRIMARY KEY,
+                name varchar(500),
+                description varchar(1000),
+                content text,
+                year_start integer,
+                year_end integer,
+                continent varchar(100),
+                period varchar(100),
+                source varchar(20),
+                external_id varchar(100),
+                sitelinks integer,
+                lon double precision,
+                lat double precision,
+                name_key varchar(500) GENERATED ALWAYS AS ({NAME_KEY_SQL}) STORED,
+                primary_ord integer,
+                event_id integer,
+                status varchar(10)
+            ) ON COMMIT DROP
+        """))
+
+        # Continente dos pontos que vieram sem ele: uma chamada vetorizada ao índice em memória
+        continents = [event.continent for _, event in rows]
+        missing = [i for i, c in enumerate(continents) if not c or c == "Outro"]
+        detected = detect_continents(
+            self.db, [rows[i][1].latitude for i in missing], [rows[i][1].longitude for i in missing]
+        )
+        for i, name in zip(missing, detected):
+            continents[i] = name
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for (ord_, event), continent in zip(rows, continents):
+            values = [
+                ord_, event.name, event.description, event.content, event.year_start,
+                event.year_end, continent, event.period or calculate_period(event.year_start),
+                event.source.value, event.external_id or "", event.sitelinks, event.longitude, event.latitude
+            ]
+            writer.writerow([COPY_NULL if v is None else v for v in values])
+        buffer.seek(0)
+
+        # COPY direto pelo cursor do psycopg2 (mesma transação da sessão)
+        cursor = self.db.connection().connection.cursor()
+        cursor.copy_expert(
+            f"COPY bulk_events_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+    def _apply(self):
+        # Duplicatas dentro do próprio lote: vale a primeira ocorrência
+        # (o ON CONFLICT não aceita a mesma chave duas vezes no mesmo comando)
+        self.db.execute(text("""
+            UPDATE bulk_events_staging s SET primary_ord = p.primary_ord
+            FROM (
+                SELECT ord, min(ord) OVER (PARTITION BY name_key, year_start, external_id) AS primary_ord
+                FROM bulk_events_staging
+            ) p
+            WHERE p.ord = s.ord
+        """))
+
+        # Upsert na chave natural; xmax = 0 distingue linha inserida de atualizada
+        self.db.execute(text("""
+            WITH upserted AS (
+                INSERT INTO events (name, description, content, year_start, year_end,
+                                    continent, period, source, external_id, sitelinks, location)
+                SELECT name, description, content, year_start, year_end,
+                       continent, period, source::eventsource, external_id, sitelinks,
+                       ST_SetSRID(ST_Point(lon, lat), 4326)
+                FROM bulk_events_staging
+                WHERE ord = primary_ord
+                ON CONFLICT (name_key, year_start, external_id) DO UPDATE
+                SET content = CASE WHEN length(coalesce(EXCLUDED.content, '')) > length(coalesce(events.content, ''))
+                                   THEN EXCLUDED.content ELSE events.content END,
+                    continent = CASE WHEN length(coalesce(EXCLUDED.content, '')) > length(coalesce(events.content, ''))
+                                     THEN EXCLUDED.continent ELSE events.continent END,
+                    sitelinks = coalesce(EXCLUDED.sitelinks, events.sitelinks)
+                -- Conteúdo só com texto mais longo; sitelinks sempre que vier valor novo
+                WHERE length(coalesce(EXCLUDED.content, '')) > length(coalesce(events.content, ''))
+                   OR coalesce(EXCLUDED.sitelinks, events.sitelinks) IS DISTINCT FROM events.sitelinks
+                RETURNING id, xmax = 0 AS inserted, name_key, year_start, external_id
+            )
+            UPDATE bulk_events_staging s
+            SET event_id = u.id, status = CASE WHEN u.inserted THEN 'created' ELSE 'updated' END
+            FROM upserted u
+            WHERE s.ord = s.primary_ord
+              AND s.name_key = u.name_key AND s.year_start = u.year_start AND s.external_id = u.external_id
+        """))
+
+        # Conflitos sem update não voltam no RETURNING: busca o id pelo índice da chave natural
+        self.db.execute(text("""
+            UPDATE bulk_events_staging s SET event_id = e.id, status = 'skipped'
+            FROM events e
+            WHERE s.ord = s.primary_ord AND s.event_id IS NULL
+              AND e.name_key = s.name_key AND e.year_start = s.year_start AND e.external_id = s.external_id
+        """))
+
+    def _collect_statuses(self, rows: List[Tuple[int, EventCreate]]) -> List[Dict]:
+        staged = {
+            r.ord: r for r in self.db.execute(text(
+                "SELECT ord, primary_ord, event_id, status FROM bulk_events_staging"
+            ))
+        }
+
+        statuses = []
+        for ord_, _ in rows:
+            row = staged[ord_]
+            primary = staged[row.primary_ord]
+            # Repetições dentro do lote apontam para o evento da primeira ocorrência
+            status = row.status if ord_ == row.primary_ord else "skipped"
+            statuses.append({"index": ord_, "status": status, "id": primary.event_id})
+        return statuses
+
+    # ========================================================================
+    # DELETE / PATCH POR FILTRO
+    # ========================================================================
+
+    @staticmethod
+    def _filter_conditions(
+        name: Optional[str] = None,
+        source: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        continent: Optional[str] = None
+    ) -> list:
+        """
+        Filtros do DELETE/PATCH. O nome compara pela chave natural (sem caixa e
+        espaços extras) e os anos limitam `year_start`, ambos cobertos por índice.
+        """
+        conditions = []
+        if name:
+            conditions.append(HistoricalEvent.name_key == HistoricalEvent.normalize_name(name))
+        if source:
+            conditions.append(HistoricalEvent.source == EventSource(source))
+        if start_year is not None:
+            conditions.append(HistoricalEvent.year_start >= start_year)
+        if end_year is not None:
+            conditions.append(HistoricalEvent.year_start <= end_year)
+        if continent:
+            conditions.append(HistoricalEvent.continent == continent)
+        return conditions
+
+    def _count(self, conditions: list) -> int:
+        return self.db.execute(select(func.count()).select_from(HistoricalEvent).where(*conditions)).scalar()
+
+    def _in_batches(self, conditions: list, build) -> Tuple[int, int]:
+        """
+        Percorre os ids do filtro em ordem (keyset) e aplica `build(ids)` a cada
+        lote numa transação própria. Devolve (linhas afetadas, lotes).
+        """
+        batch_size = settings.bulk_mutation_batch_size
+        affected = batches = 0
+        last_id = 0
+
+        try:
+            while True:
+                ids = self.db.execute(
+                    select(HistoricalEvent.id)
+                    .where(*conditions, HistoricalEvent.id > last_id)
+                    .order_by(HistoricalEvent.id)
+                    .limit(batch_size)
+                ).scalars().all()
+                if not ids:
+                    break
+
+                stmt = build(ids).execution_options(synchronize_session=False)
+                affected += self.db.execute(stmt).rowcount
+                self.db.commit()
+                batches += 1
+                last_id = ids[-1]
+
+                if len(ids) < batch_size:
+                    break
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            # Lotes já commitados valem mesmo se um posterior falhar
+            if batches:
+                response_cache.bump_version()
+
+        return affected, batches
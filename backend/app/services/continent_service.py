@@ -0,0 +1,130 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, text
+
+from ..config import get_settings
+from ..utils.continent_index import UNKNOWN, NO_MATCH
+from .response_cache import response_cache
+from .task_manager import task_manager
+
+settings = get_settings()
+
+# Máximo de vértices por pedaço no ST_Subdivide
+SUBDIVIDE_MAX_VERTICES = 128
+
+# Rótulos de detecção que falhou ou nunca rodou (alvo do modo only_unresolved)
+UNRESOLVED_CONTINENTS = (UNKNOWN, "Erro na Detecção", "Outro")
+
+
+class ContinentService:
+    """
+    Reclassificação de continente dos eventos direto no PostGIS.
+    Usa a tabela derivada `settings.continents_subdivided` (polígonos quebrados
+    com ST_Subdivide + GiST) e roda em faixas de id, um UPDATE ... FROM por faixa.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh_pieces(self) -> int:
+        """Recria os pedaços subdivididos a partir de `continents_shapes`."""
+        self.db.execute(text("TRUNCATE settings.continents_subdivided RESTART IDENTITY"))
+        result = self.db.execute(text("""
+            INSERT INTO settings.continents_subdivided (shape_id, name, geom)
+            SELECT id, name, ST_Subdivide(geom, :max_vertices)
+            FROM settings.continents_shapes
+        """), {"max_vertices": SUBDIVIDE_MAX_VERTICES})
+        self.db.commit()
+        return result.rowcount
+
+    def ensure_pieces(self):
+        """Gera os pedaços no startup se ainda não existirem (usados pelo trigger opcional)."""
+        exists = self.db.execute(text("SELECT EXISTS (SELECT 1 FROM settings.continents_subdivided)")).scalar()
+        if not exists:
+            count = self.refresh_pieces()
+            print(f"🧩 {count} pedaços de continentes gerados (ST_Subdivide)")
+
+    def reclassify(self, task_id: str, only_unresolved: bool = False) -> int:
+        """
+        Recalcula o continente de todos os eventos (ou só dos sem continente
+        resolvido) em faixas de `reclassify_batch_size` ids, com commit e
+        progresso no task_manager a cada faixa. Devolve quantas linhas mudaram.
+        """
+        def log(msg):
+            task_manager.log(task_id, msg)
+
+        task_manager.set_status(task_id, "running")
+        changed = 0
+        try:
+            pieces = self.refresh_pieces()
+            log(f"🧩 {pieces} pedaços de continentes gerados (ST_Subdivide)")
+
+            low, high = self.db.execute(text("SELECT min(id), max(id) FROM events")).one()
+            if low is None:
+                log("💤 Nenhum evento para reclassificar.")
+                task_manager.set_status(task_id, "completed")
+                return 0
+
+            batch = settings.reclassify_batch_size
+            for start in range(low, high + 1, batch):
+                if task_manager.should_stop(task_id):
+                    log(f"🛑 Interrompido. {changed} eventos atualizados até aqui.")
+                    task_manager.set_status(task_id, "cancelled")
+                    return changed
+
+                changed += self._reclassify_range(start, start + batch - 1, only_unresolved)
+                self.db.commit()
+                task_manager.set_progress(task_id, (start + batch - low) * 100 / (high - low + 1))
+
+                if ((start - low) // batch) % 20 == 0:
+                    log(f"📈 Até o id {min(start + batch - 1, high)}: {changed} eventos atualizados")
+
+            log(f"🏁 Reclassificação concluída: {changed} eventos atualizados.")
+            task_manager.set_progress(task_id, 100)
+            task_manager.set_status(task_id, "completed")
+            return changed
+
+        except Exception as e:
+            self.db.rollback()
+            log(f"❌ Erro Crítico: {str(e)}")
+            task_manager.set_status(task_id, "error")
+            return changed
+        finally:
+            if changed:
+                response_cache.bump_version()
+
+    def _reclassify_range(self, low: int, high: int, only_unresolved: bool) -> int:
+        """
+        Um UPDATE ... FROM com junção espacial para a faixa [low, high].
+        Mesmos rótulos da detecção na API: sem ponto ou (0, 0) = 'Desconhecido',
+        fora de todos os polígonos = 'Oceano / Outro'; só grava o que mudou.
+        """
+        unresolved_filter = (
+            "AND (ev.continent IS NULL OR ev.continent IN :unresolved)" if only_unresolved else ""
+        )
+        stmt = text(f"""
+            UPDATE events e SET continent = r.name
+            FROM (
+                SELECT ev.id,
+                       CASE
+                           WHEN ev.location IS NULL OR (ST_X(ev.location) = 0 AND ST_Y(ev.location) = 0)
+                               THEN :unknown
+                           ELSE coalesce(m.name, :no_match)
+                       END AS name
+                FROM events ev
+                LEFT JOIN LATERAL (
+                    SELECT p.name
+                    FROM settings.continents_subdivided p
+                    WHERE ST_Intersects(p.geom, ev.location)
+                    ORDER BY p.shape_id
+                    LIMIT 1
+                ) m ON true
+                WHERE ev.id BETWEEN :low AND :high {unresolved_filter}
+            ) r
+            WHERE e.id = r.id AND e.continent IS DISTINCT FROM r.name
+        """)
+        params = {"low": low, "high": high, "unknown": UNKNOWN, "no_match": NO_MATCH}
+        if only_unresolved:
+            stmt = stmt.bindparams(bindparam("unresolved", expanding=True))
+            params["unresolved"] = list(UNRESOLVED_CONTINENTS)
+        return self.db.execute(stmt, params).rowcount
+
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from ..models import HistoricalEvent
+from .response_cache import response_cache
 
 class DeduplicateService:
     def __init__(self, db: Session):
@@ -20,4 +21,5 @@ class DeduplicateService:
         """)
         result = self.db.execute(sql)
         self.db.commit()
+        response_cache.bump_version()
         return result.rowcount
\ No newline at end of file
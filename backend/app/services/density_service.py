@@ -0,0 +1,254 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, text
+from typing import Iterator, List, Optional, Tuple
+
+from ..database import SessionLocal
+from .response_cache import response_cache
+from .task_manager import task_manager
+
+# Lado da célula (metros em Web Mercator) de cada resolução do GET /events/density
+DENSITY_CELL_SIZES_M = (1_000_000, 500_000, 250_000, 100_000, 50_000)
+
+# formato -> (gerador da grade, célula a partir de (i, j))
+DENSITY_SHAPES = {
+    "hex": ("ST_HexagonGrid", "ST_Hexagon"),
+    "square": ("ST_SquareGrid", "ST_Square"),
+}
+
+# Ponto do evento em Web Mercator (latitude limitada, o 3857 não chega aos polos)
+MERCATOR_POINT_SQL = (
+    "ST_Transform(ST_SetSRID(ST_MakePoint("
+    "ST_X(e.location), greatest(-85.0, least(85.0, ST_Y(e.location)))), 4326), 3857)"
+)
+
+Range = Tuple[int, int]
+
+
+class DensityService:
+    """
+    Mapa de densidade (heatmap) em células hexagonais ou quadradas.
+    Séculos inteiros dentro da janela vêm do resumo `event_density_cells`;
+    as pontas parciais e os séculos marcados como sujos são contados direto de
+    `events`, então a resposta é sempre exata. O resumo é refeito sozinho
+    (run_density_rebuild) no startup e ao fim de ETLs, ingestões e mutações em
+    lote; até lá os séculos alterados custam uma contagem ao vivo.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def stream_density(
+        self,
+        start_year: int,
+        end_year: int,
+        resolution: int = 1,
+        shape: str = "hex",
+        continent: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """FeatureCollection de polígonos com `count` (eventos que começam na janela)."""
+        full = self._full_centuries(start_year, end_year)
+        clean = self._clean_centuries(full)
+        live = self._live_ranges(start_year, end_year, [c for c in full if c not in clean])
+
+        size = DENSITY_CELL_SIZES_M[resolution]
+        stmt, params = self._density_query(shape, resolution, size, clean, live, continent)
+        result = self.db.execute(stmt.execution_options(yield_per=1000), params)
+
+        yield b'{"type":"FeatureCollection","features":['
+        separator = ""
+        for batch in result.scalars().partitions():
+            yield (separator + ",".join(batch)).encode("utf-8")
+            separator = ","
+        yield b"]}"
+
+    def ensure_centuries(self):
+        """Marca como sujos os séculos com eventos que ainda não têm resumo (bancos anteriores ao resumo)."""
+        added = self.db.execute(text("""
+            INSERT INTO event_density_centuries (century, dirty)
+            SELECT DISTINCT floor(year_start / 100.0)::int, true FROM events
+            ON CONFLICT (century) DO NOTHING
+        """)).rowcount
+        self.db.commit()
+        if added:
+            print(f"🧮 {added} séculos sem resumo de densidade marcados para reagregação")
+
+    def rebuild(self, task_id: str, full: bool = False) -> int:
+        """
+        Reagrega os séculos sujos (ou todos, com `full`), um por transação,
+        para todos os formatos e resoluções. Devolve quantos séculos foram refeitos.
+        """
+        def log(msg):
+            task_manager.log(task_id, msg)
+
+        task_manager.set_status(task_id, "running")
+        done = 0
+        try:
+            if full:
+                self.db.execute(text("""
+                    INSERT INTO event_density_centuries (century, dirty)
+                    SELECT DISTINCT floor(year_start / 100.0)::int, true FROM events
+                    ON CONFLICT (century) DO UPDATE SET dirty = true
+                """))
+                self.db.commit()
+
+            centuries = self.db.execute(text(
+                "SELECT century FROM event_density_centuries WHERE dirty ORDER BY century"
+            )).scalars().all()
+            if not centuries:
+                log("💤 Resumo de densidade já está em dia.")
+                task_manager.set_status(task_id, "completed")
+                return 0
+
+            log(f"🧮 Reagregando {len(centuries)} séculos...")
+            for century in centuries:
+                if task_manager.should_stop(task_id):
+                    log(f"🛑 Interrompido. {done} séculos reagregados.")
+                    task_manager.set_status(task_id, "cancelled")
+                    return done
+
+                self._rebuild_century(century)
+                self.db.commit()
+                done += 1
+                task_manager.set_progress(task_id, done * 100 / len(centuries))
+
+            log(f"🏁 Resumo de densidade atualizado ({done} séculos).")
+            task_manager.set_status(task_id, "completed")
+            return done
+
+        except Exception as e:
+            self.db.rollback()
+            log(f"❌ Erro Crítico: {str(e)}")
+            task_manager.set_status(task_id, "error")
+            return done
+        finally:
+            if done:
+                response_cache.bump_version()
+
+    # ========================================================================
+    # MÉTODOS PRIVADOS
+    # ========================================================================
+
+    @staticmethod
+    def _full_centuries(start_year: int, end_year: int) -> List[int]:
+        """Séculos [c*100, c*100+99] inteiramente dentro da janela."""
+        first = -(-start_year // 100)  # teto
+        last = (end_year + 1) // 100 - 1
+        return list(range(first, last + 1))
+
+    def _clean_centuries(self, centuries: List[int]) -> List[int]:
+        if not centuries:
+            return []
+        return self.db.execute(
+            text("""
+                SELECT century FROM event_density_centuries
+                WHERE NOT dirty AND century BETWEEN :first AND :last
+            """),
+            {"first": centuries[0], "last": centuries[-1]}
+        ).scalars().all()
+
+    @staticmethod
+    def _live_ranges(start_year: int, end_year: int, dirty: List[int]) -> List[Range]:
+        """Faixas de anos contadas direto de `events`: pontas parciais + séculos sujos."""
+        full = DensityService._full_centuries(start_year, end_year)
+        if not full:
+            return [(start_year, end_year)]
+
+        ranges = [(c * 100, c * 100 + 99) for c in dirty]
+        if start_year < full[0] * 100:
+            ranges.append((start_year, full[0] * 100 - 1))
+        if end_year > full[-1] * 100 + 99:
+            ranges.append((full[-1] * 100 + 100, end_year))
+        return ranges
+
+    @staticmethod
+    def _density_query(
+        shape: str,
+        resolution: int,
+        size: float,
+        clean: List[int],
+        live: List[Range],
+        continent: Optional[str] = None
+    ):
+        grid, cell = DENSITY_SHAPES[shape]
+        params = {"shape": shape, "resolution": resolution, "size": size}
+        by_continent = continent and continent != "Todos"
+        if by_continent:
+            params["continent"] = continent
+
+        parts = []
+        if clean:
+            params["clean"] = clean
+            parts.append(f"""
+                SELECT i, j, sum(total) AS total
+                FROM event_density_cells
+                WHERE shape = :shape AND resolution = :resolution AND century IN :clean
+                  {"AND continent = :continent" if by_continent else ""}
+                GROUP BY i, j
+            """)
+
+        if live:
+            year_filter = " OR ".join(
+                f"e.year_start BETWEEN :live_lo_{n} AND :live_hi_{n}" for n in range(len(live))
+            )
+            for n, (lo, hi) in enumerate(live):
+                params[f"live_lo_{n}"], params[f"live_hi_{n}"] = lo, hi
+            parts.append(f"""
+                SELECT c.i, c.j, count(*) AS total
+                FROM events e
+                CROSS JOIN LATERAL (
+                    SELECT i, j FROM {grid}(:size, {MERCATOR_POINT_SQL}) LIMIT 1
+                ) c
+                WHERE ({year_filter}) {"AND e.continent = :continent" if by_continent else ""}
+                GROUP BY c.i, c.j
+            """)
+
+        # Sempre há ao menos uma parte: sem séculos limpos, a janela inteira é contada ao vivo
+        stmt = text(f"""
+            SELECT json_build_object(
+                'type', 'Feature',
+                'geometry', ST_AsGeoJSON(
+                    ST_Transform(ST_SetSRID({cell}(:size, i, j), 3857), 4326), 5
+                )::json,
+                'properties', json_build_object('i', i, 'j', j, 'count', sum(total))
+            )::text
+            FROM ({" UNION ALL ".join(parts)}) counts
+            GROUP BY i, j
+        """)
+        if clean:
+            stmt = stmt.bindparams(bindparam("clean", expanding=True))
+        return stmt, params
+
+    def _rebuild_century(self, century: int):
+        """Troca as células de um século e marca-o como limpo (mesma transação)."""
+        # Apaga a marca antes de contar: escrita concorrente volta a sujar o século
+        self.db.execute(
+            text("UPDATE event_density_centuries SET dirty = false WHERE century = :century"),
+            {"century": century}
+        )
+        self.db.execute(text("DELETE FROM event_density_cells WHERE century = :century"), {"century": century})
+
+        for shape, (grid, _) in DENSITY_SHAPES.items():
+            for resolution, size in enumerate(DENSITY_CELL_SIZES_M):
+                self.db.execute(text(f"""
+                    INSERT INTO event_density_cells (shape, resolution, century, continent, i, j, total)
+                    SELECT :shape, :resolution, :century, coalesce(e.continent, ''), c.i, c.j, count(*)
+                    FROM events e
+                    CROSS JOIN LATERAL (
+                        SELECT i, j FROM {grid}(:size, {MERCATOR_POINT_SQL}) LIMIT 1
+                    ) c
+                    WHERE e.year_start BETWEEN :century * 100 AND :century * 100 + 99
+                    GROUP BY coalesce(e.continent, ''), c.i, c.j
+                """), {"shape": shape, "resolution": resolution, "century": century, "size": size})
+
+
+def run_density_rebuild(task_id: Optional[str] = None, full: bool = False) -> int:
+    """
+    Reagrega os séculos sujos numa sessão própria, para rodar em background
+    depois de jobs que escrevem em `events` (cria a tarefa se não vier uma).
+    """
+    task_id = task_id or task_manager.create_task("Resumo do mapa de densidade")
+    db = SessionLocal()
+    try:
+        return DensityService(db).rebuild(task_id, full)
+    finally:
+        db.close()
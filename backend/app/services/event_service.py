@@ -1,13 +1,61 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import heapq
+import json
+from sqlalchemy import JSON, String, Text, case, cast, false, literal_column, null, or_, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from geoalchemy2 import Geography
 from geoalchemy2.shape import to_shape
 from shapely.geometry import mapping
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from ..models import HistoricalEvent, EventSource
-from ..schemas import EventCreate, EventResponse, EventGeoCollection, EventGeoFeature
+from ..models import HistoricalEvent, EventSource, EventTombstone
+from ..models.events import FEATURE_PROPERTY_COLUMNS
+from ..models.changes import CHANGE_WATERMARK_SQL
+from ..schemas import (
+    EventCreate,
+    EventResponse,
+    EventChangesPage,
+    EventGeoCollection,
+    EventGeoFeature,
+    EventNearResult,
+    EventSearchResult,
+    EventSearchPage
+)
 from ..utils.helpers import calculate_period
 from ..utils.spatial import get_continent_from_coords
+from .response_cache import response_cache
+
+# Abaixo deste zoom o mapa recebe clusters prontos em vez de pontos individuais
+CLUSTER_MAX_ZOOM = 12
+# Lado aproximado (em pixels de tela) de cada célula de agrupamento
+CLUSTER_CELL_PX = 64
+
+# Extensão (em unidades do tile) e margem usadas no ST_AsMVTGeom
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+
+# Linhas buscadas por ida ao cursor server-side no streaming NDJSON
+STREAM_BATCH_SIZE = 1000
+
+# Passos da reprodução (GET /events/playback) lidos por consulta: entre um
+# trecho e outro a conexão volta ao pool, então as pausas não prendem conexão
+PLAYBACK_CHUNK_STEPS = 100
+
+# No GET /events/near geodésico, quantos candidatos por vizinho pedido
+# saem do KNN planar (<->) para serem reordenados pela distância no esferoide
+NEAR_CANDIDATE_FACTOR = 4
+
+# Properties da Feature GeoJSON -> coluna de origem (mesma ordem de _to_geo_feature)
+FEATURE_PROPERTIES = {prop: getattr(HistoricalEvent, column) for prop, column in FEATURE_PROPERTY_COLUMNS}
+
+# Perfis de projeção do GET /events (o `id` sempre vai junto)
+FIELD_PROFILES = {
+    "map": ["name", "year"],
+}
+
+BBox = Tuple[float, float, float, float]
+Cursor = Tuple[int, int]
+
 
 class EventService: 
     """Serviço para gerenciamento de eventos históricos."""
@@ -15,37 +63,346 @@ class EventService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all(self) -> List[EventResponse]:
-        """Retorna todos os eventos ordenados por ano."""
-        events = (
-            self.db.query(HistoricalEvent)
-            .order_by(HistoricalEvent.year_start)
-            .all()
-        )
-        return [self._to_response(e) for e in events]
+    def get_all(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[Cursor] = None
+    ) -> List[EventResponse]:
+        """
+        Retorna eventos ordenados por (ano, id).
+        Com `limit` funciona como página keyset: `cursor` é o (year_start, id)
+        do último item da página anterior.
+        """
+        return [self._to_response(e) for e in self.db.execute(self._all_query(limit, cursor)).scalars()]
+
+    def stream_all(self, cursor: Optional[Cursor] = None) -> Iterator[bytes]:
+        """
+        Gera todos os eventos em NDJSON (um objeto por linha), lote a lote.
+        Usa cursor server-side (yield_per), então a memória fica constante
+        independente do tamanho da tabela.
+        """
+        stmt = self._ndjson_query(cursor)
+        result = self.db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        for batch in result.partitions():
+            yield self._ndjson_batch(batch)
 
     def get_filtered(
         self, 
         start_year: int, 
         end_year: int, 
-        continent: Optional[str] = None
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        zoom: Optional[int] = None
     ) -> EventGeoCollection:
-        """Retorna eventos filtrados como GeoJSON."""
-        query = self.db.query(HistoricalEvent).filter(
-            and_(
-                HistoricalEvent.year_start >= start_year,
-                HistoricalEvent.year_start <= end_year
-            )
-        )
-        
-        if continent and continent != "Todos":
-            query = query.filter(HistoricalEvent.continent == continent)
+        """
+        Retorna eventos filtrados como GeoJSON.
+        Com `zoom` abaixo de CLUSTER_MAX_ZOOM os pontos são agrupados no PostGIS
+        e cada feature representa um cluster (contagem, centróide e evento representativo).
+        """
+        conditions = self._window_conditions(start_year, end_year, continent, bbox)
+
+        if zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            return EventGeoCollection(features=self._clustered_features(conditions, zoom))
 
-        events = query.all()
+        events = self.db.query(HistoricalEvent).filter(*conditions).all()
         features = [self._to_geo_feature(e) for e in events]
         
         return EventGeoCollection(features=features)
 
+    def stream_filtered(
+        self,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Caminho rápido do mapa: cada Feature já sai do Postgres como texto JSON
+        (a coluna `geojson_feature`, ou json_build_object com `fields`) e o
+        FeatureCollection é montado só concatenando bytes, sem shapely/Pydantic por linha.
+        `fields` limita as properties já no SELECT (ver resolve_fields);
+        `max_features` limita a N eventos por célula do zoom (ver _sampled).
+        """
+        stmt = self._features_query(start_year, end_year, continent, bbox, fields, zoom, max_features)
+        result = self.db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        yield b'{"type":"FeatureCollection","features":['
+        separator = ""
+        for batch in result.scalars().partitions():
+            yield (separator + ",".join(batch)).encode("utf-8")
+            separator = ","
+        yield b"]}"
+
+    def stream_playback(
+        self,
+        from_year: int,
+        to_year: int,
+        step: int,
+        window: Optional[int] = None,
+        continent: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[bytes]:
+        """
+        Reprodução da linha do tempo em Server-Sent Events: para cada passo
+        (from_year, from_year + step, ... até to_year) a janela é
+        [ano, ano + window - 1] e sai um evento SSE `step` só com as Features que
+        entram e os ids que saem. Linhas ordenadas por year_start alimentam a
+        janela; os ativos ficam num heap pelo ano final, de onde saem ao expirar.
+        Eventos que começam e terminam entre dois passos não aparecem.
+        As linhas são lidas em trechos de PLAYBACK_CHUNK_STEPS passos e a sessão é
+        fechada antes de gerar os quadros, então o chamador pode pausar entre eles
+        sem segurar conexão nem transação abertas.
+        """
+        window = window or step
+        years = range(from_year, to_year + 1, step)
+        active: List[Tuple[int, int]] = []  # heap de (ano final, id)
+        read_until = None  # maior year_start já lido nos trechos anteriores
+
+        for offset in range(0, len(years), PLAYBACK_CHUNK_STEPS):
+            chunk = years[offset:offset + PLAYBACK_CHUNK_STEPS]
+            chunk_end = chunk[-1] + window - 1
+            stmt = self._playback_query(chunk[0], chunk_end, continent, fields, after=read_until)
+            rows = self.db.execute(stmt).all()
+            self.db.close()  # devolve a conexão ao pool antes dos quadros (e das pausas)
+            read_until = chunk_end
+
+            yield from self._playback_frames(chunk, window, rows, active)
+
+        yield b"event: end\ndata: {}\n\n"
+
+    @staticmethod
+    def _playback_frames(years: range, window: int, rows: list, active: List[Tuple[int, int]]) -> Iterator[bytes]:
+        """Quadros `step` de um trecho; `active` (heap) segue para o trecho seguinte."""
+        rows = iter(rows)
+        pending = next(rows, None)
+
+        for year in years:
+            start, end = year, year + window - 1
+
+            entering = []
+            while pending is not None and pending.year_start <= end:
+                if pending.year_last >= start:
+                    heapq.heappush(active, (pending.year_last, pending.id))
+                    entering.append(pending.feature)
+                pending = next(rows, None)
+
+            leaving = []
+            while active and active[0][0] < start:
+                leaving.append(heapq.heappop(active)[1])
+
+            data = (
+                f'{{"year":{year},"start":{start},"end":{end},"active":{len(active)},'
+                f'"enter":[{",".join(entering)}],"leave":{json.dumps(leaving)}}}'
+            )
+            yield f"id: {year}\nevent: step\ndata: {data}\n\n".encode("utf-8")
+
+    def get_columns(
+        self,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ) -> Dict[str, list]:
+        """
+        Mesmos eventos do GET /events em colunas (id, lon, lat + properties),
+        para os formatos binários (Arrow/MessagePack). Com zoom baixo, as colunas
+        são as dos clusters (inclui point_count), a não ser que `max_features` peça amostragem.
+        """
+        if max_features is None and zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            conditions = self._window_conditions(start_year, end_year, continent, bbox)
+            return self._cluster_columns(self.db.execute(self._clusters_query(conditions, zoom)).all())
+
+        result = self.db.execute(
+            self._columns_query(start_year, end_year, continent, bbox, fields, zoom, max_features)
+        )
+        return self._rows_to_columns(list(result.keys()), result.all())
+
+    def get_facets(self, start_year: Optional[int] = None, end_year: Optional[int] = None) -> dict:
+        """
+        Valores distintos de continente, período e fonte com suas contagens,
+        calculados numa única varredura com GROUPING SETS.
+        Com start_year/end_year as contagens respeitam a janela do slider.
+        """
+        return self._facets_from_rows(self.db.execute(self._facets_query(start_year, end_year)))
+
+    def search(
+        self,
+        q: str,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        continent: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> EventSearchPage:
+        """
+        Busca textual ranqueada em nome, descrição e conteúdo.
+        Combina o tsvector (pt + en, índice GIN) com similaridade de trigramas
+        no nome (pg_trgm), que cobre erros de digitação.
+        """
+        ts_query = (
+            func.websearch_to_tsquery(literal_column("'portuguese'::regconfig"), q)
+            .op("||")(func.websearch_to_tsquery(literal_column("'english'::regconfig"), q))
+        )
+        rank = (func.ts_rank_cd(HistoricalEvent.search_vector, ts_query) + func.similarity(HistoricalEvent.name, q))
+
+        conditions = [or_(
+            HistoricalEvent.search_vector.op("@@")(ts_query),
+            HistoricalEvent.name.op("%")(q)
+        )]
+        if start_year is not None or end_year is not None:
+            conditions += self._window_conditions(start_year, end_year, continent)
+        elif continent and continent != "Todos":
+            conditions.append(HistoricalEvent.continent == continent)
+
+        rows = (
+            self.db.query(HistoricalEvent, rank.label("rank"))
+            .filter(*conditions)
+            .order_by(rank.desc(), HistoricalEvent.id)
+            .offset(offset)
+            .limit(limit + 1)
+            .all()
+        )
+
+        items = [
+            EventSearchResult(**self._to_response(event).model_dump(), rank=score)
+            for event, score in rows[:limit]
+        ]
+        return EventSearchPage(
+            items=items,
+            limit=limit,
+            offset=offset,
+            next_offset=offset + limit if len(rows) > limit else None
+        )
+
+    def near(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        continent: Optional[str] = None,
+        geodesic: bool = False
+    ) -> List[EventNearResult]:
+        """
+        Os `k` eventos mais próximos do ponto, do mais perto ao mais longe.
+        A ordenação usa o operador KNN `<->` sobre o índice GiST de `location`,
+        então o custo não depende do tamanho da tabela (ver _near_query).
+        """
+        rows = self.db.execute(self._near_query(lat, lon, k, start_year, end_year, continent, geodesic)).all()
+        return [EventNearResult(**row._asdict()) for row in rows]
+
+    def get_changes(self, since: Optional[Cursor] = None, limit: int = 1000) -> EventChangesPage:
+        """
+        Feed incremental: eventos inseridos/alterados e apagados (tombstones)
+        depois do cursor (change_seq, id), em ordem de change_seq.
+        Só entram transações abaixo da marca d'água (todas já terminadas), então
+        um commit tardio de transação mais antiga nunca fica para trás do cursor.
+        Sem `since` devolve só o cursor atual, para o cliente marcar antes da carga completa.
+        """
+        # Lida antes das consultas: tudo abaixo dela já é visível nos SELECTs seguintes
+        watermark = self.db.execute(text(CHANGE_WATERMARK_SQL)).scalar()
+        if since is None:
+            return EventChangesPage(upserts=[], deleted=[], next_since=str(watermark))
+
+        events = self.db.execute(self._changes_query(since, watermark, limit + 1)).all()
+        tombstones = self.db.execute(self._tombstones_query(since, watermark, limit + 1)).all()
+
+        # Intercala as duas listas (já ordenadas) pela mesma chave do keyset
+        changes = sorted(
+            [(row.change_seq, row.id, row) for row in events] +
+            [(row.change_seq, row.event_id, None) for row in tombstones],
+            key=lambda change: change[:2]
+        )
+        page, has_more = changes[:limit], len(changes) > limit
+
+        if has_more:
+            next_since = f"{page[-1][0]}:{page[-1][1]}"
+        else:
+            next_since = str(max(watermark, since[0]))
+
+        return EventChangesPage(
+            upserts=[EventResponse(**row._asdict()) for _, _, row in page if row is not None],
+            deleted=[event_id for _, event_id, row in page if row is None],
+            next_since=next_since,
+            has_more=has_more
+        )
+
+    def get_by_id(self, event_id: int) -> Optional[EventResponse]:
+        """Detalhe completo de um evento (conteúdo incluído), usado no popup do mapa."""
+        event = self.db.query(HistoricalEvent).filter(HistoricalEvent.id == event_id).first()
+        return self._to_response(event) if event else None
+
+    @staticmethod
+    def resolve_fields(fields: Optional[str] = None, profile: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Converte os parâmetros `fields`/`profile` do GET /events na lista de properties.
+        None significa "todas". Lança ValueError para nomes desconhecidos.
+        """
+        if profile:
+            if profile not in FIELD_PROFILES:
+                raise ValueError(f"Perfil desconhecido: {profile}. Use: {', '.join(FIELD_PROFILES)}")
+            return FIELD_PROFILES[profile]
+
+        if not fields:
+            return None
+
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in FEATURE_PROPERTIES]
+        if unknown:
+            raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}")
+        return requested
+
+    def get_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None
+    ) -> bytes:
+        """
+        Gera um Mapbox Vector Tile (camada 'events') com os mesmos filtros de get_filtered.
+        O recorte pelo envelope do tile usa o índice GiST de `location`.
+        """
+        envelope = func.ST_TileEnvelope(z, x, y)
+        conditions = self._window_conditions(start_year, end_year, continent)
+        conditions.append(HistoricalEvent.location.op("&&")(func.ST_Transform(envelope, 4326)))
+
+        tile_rows = (
+            select(
+                func.ST_AsMVTGeom(
+                    func.ST_Transform(HistoricalEvent.location, 3857),
+                    envelope,
+                    MVT_EXTENT,
+                    MVT_BUFFER
+                ).label("geom"),
+                HistoricalEvent.id,
+                HistoricalEvent.name,
+                HistoricalEvent.year_start.label("year"),
+                HistoricalEvent.year_end,
+                HistoricalEvent.period,
+                HistoricalEvent.continent,
+                # O MVT só aceita tipos escalares; o ENUM vai como texto
+                cast(HistoricalEvent.source, String).label("source")
+            )
+            .where(*conditions)
+            .subquery("tile")
+        )
+
+        tile = self.db.execute(
+            select(func.ST_AsMVT(tile_rows.table_valued(), "events", MVT_EXTENT, "geom"))
+        ).scalar()
+        return bytes(tile) if tile else b""
+
     def detect_continent(self, latitude: float, longitude: float) -> str:
         """
         Método público para ser usado pela API (/events/detect-continent).
@@ -54,14 +411,55 @@ class EventService:
         return get_continent_from_coords(self.db, latitude, longitude)
 
     def create(self, event_data: EventCreate) -> dict:
-        """Cria ou atualiza um evento."""
-        # Verifica duplicata por Nome + Ano
-        existing = self._find_existing(event_data.name, event_data.year_start)
-        
-        if existing: 
-            return self._handle_existing(existing, event_data)
-        
-        return self._create_new(event_data)
+        """
+        Cria ou atualiza um evento num único INSERT ... ON CONFLICT sobre a chave
+        natural (nome normalizado + ano + external_id).
+        Regra de duplicata: o existente só é atualizado se o conteúdo novo for mais longo.
+        """
+        # Se o frontend mandou continente, usa. Se não, tenta detectar aqui também.
+        continent_val = event_data.continent
+        if not continent_val or continent_val == "Outro":
+            continent_val = self.detect_continent(event_data.latitude, event_data.longitude)
+
+        stmt = insert(HistoricalEvent).values(
+            name=event_data.name,
+            description=event_data.description,
+            content=event_data.content,
+            year_start=event_data.year_start,
+            year_end=event_data.year_end,
+            continent=continent_val,
+            period=event_data.period or calculate_period(event_data.year_start),
+            source=EventSource(event_data.source),
+            external_id=event_data.external_id or "",
+            sitelinks=event_data.sitelinks,
+            # Cria o ponto WKT para o PostGIS
+            location=f"SRID=4326;POINT({event_data.longitude} {event_data.latitude})"
+        )
+        # Conteúdo/continente só mudam com conteúdo mais longo; sitelinks sempre
+        # que vier valor novo (reexecuções do ETL alimentam o `importance`)
+        longer = func.length(func.coalesce(stmt.excluded.content, "")) > func.length(func.coalesce(HistoricalEvent.content, ""))
+        sitelinks = func.coalesce(stmt.excluded.sitelinks, HistoricalEvent.sitelinks)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=HistoricalEvent.natural_key(),
+            set_={
+                "content": case((longer, stmt.excluded.content), else_=HistoricalEvent.content),
+                "continent": case((longer, stmt.excluded.continent), else_=HistoricalEvent.continent),
+                "sitelinks": sitelinks
+            },
+            where=or_(longer, sitelinks.is_distinct_from(HistoricalEvent.sitelinks))
+        ).returning(HistoricalEvent.id, literal_column("xmax = 0").label("inserted"))
+
+        row = self.db.execute(stmt).first()
+        self.db.commit()
+
+        if row is None:
+            # Conflito sem update (conteúdo não é mais longo, sitelinks iguais): nada mudou, cache continua válido
+            return {"status": "skipped", "id": self._find_existing(event_data)}
+
+        response_cache.bump_version()
+        if row.inserted:
+            return {"status": "created", "id": row.id, "name": event_data.name}
+        return {"status": "updated", "id": row.id}
 
     def delete(self, event_id: int) -> bool:
         """Deleta um evento pelo ID."""
@@ -74,68 +472,435 @@ class EventService:
         
         self.db.delete(event)
         self.db.commit()
+        response_cache.bump_version()
         return True
 
+    # ========================================================================
+    # CONSULTAS (compartilhadas com o AsyncEventService)
+    # ========================================================================
+
+    @staticmethod
+    def _event_columns() -> list:
+        """Colunas do EventResponse direto do SELECT (lat/lon via PostGIS, sem shapely)."""
+        return [
+            HistoricalEvent.id,
+            HistoricalEvent.name,
+            HistoricalEvent.description,
+            HistoricalEvent.content,
+            HistoricalEvent.year_start,
+            HistoricalEvent.year_end,
+            HistoricalEvent.continent,
+            HistoricalEvent.period,
+            cast(HistoricalEvent.source, String).label("source"),
+            func.ST_Y(HistoricalEvent.location).label("latitude"),
+            func.ST_X(HistoricalEvent.location).label("longitude")
+        ]
+
+    @staticmethod
+    def _all_query(limit: Optional[int] = None, cursor: Optional[Cursor] = None):
+        stmt = select(HistoricalEvent)
+        if cursor:
+            stmt = stmt.where(tuple_(HistoricalEvent.year_start, HistoricalEvent.id) > cursor)
+
+        stmt = stmt.order_by(HistoricalEvent.year_start, HistoricalEvent.id)
+        if limit:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    @classmethod
+    def _ndjson_query(cls, cursor: Optional[Cursor] = None):
+        stmt = select(*cls._event_columns())
+        if cursor:
+            stmt = stmt.where(tuple_(HistoricalEvent.year_start, HistoricalEvent.id) > cursor)
+        return stmt.order_by(HistoricalEvent.year_start, HistoricalEvent.id)
+
+    @staticmethod
+    def _ndjson_batch(rows) -> bytes:
+        return "".join(
+            json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+
+    @classmethod
+    def _changes_query(cls, since: Cursor, watermark: int, limit: int):
+        """Eventos gravados depois de `since` e antes da marca d'água (usa ix_events_change_seq)."""
+        return (
+            select(*cls._event_columns(), HistoricalEvent.change_seq)
+            .where(
+                tuple_(HistoricalEvent.change_seq, HistoricalEvent.id) > since,
+                HistoricalEvent.change_seq < watermark
+            )
+            .order_by(HistoricalEvent.change_seq, HistoricalEvent.id)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def _tombstones_query(since: Cursor, watermark: int, limit: int):
+        return (
+            select(EventTombstone.change_seq, EventTombstone.event_id)
+            .where(
+                tuple_(EventTombstone.change_seq, EventTombstone.event_id) > since,
+                EventTombstone.change_seq < watermark
+            )
+            .order_by(EventTombstone.change_seq, EventTombstone.event_id)
+            .limit(limit)
+        )
+
+    @classmethod
+    def _near_query(
+        cls,
+        lat: float,
+        lon: float,
+        k: int,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        continent: Optional[str] = None,
+        geodesic: bool = False
+    ):
+        """
+        KNN: `ORDER BY location <-> ponto LIMIT k` percorre o índice GiST em ordem
+        de distância. O `<->` é planar (graus); distance_m sai de ST_DistanceSphere.
+        Com `geodesic`, os k * NEAR_CANDIDATE_FACTOR primeiros do KNN são
+        reordenados pela distância no esferoide (geography), que corrige a
+        distorção dos graus de longitude longe do equador.
+        """
+        point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+
+        conditions = []
+        if start_year is not None or end_year is not None:
+            conditions += cls._window_conditions(start_year, end_year, continent)
+        elif continent and continent != "Todos":
+            conditions.append(HistoricalEvent.continent == continent)
+
+        knn = HistoricalEvent.location.op("<->")(point)
+        if not geodesic:
+            distance = func.ST_DistanceSphere(HistoricalEvent.location, point).label("distance_m")
+            return (
+                select(*cls._event_columns(), distance)
+                .where(*conditions)
+                .order_by(knn, HistoricalEvent.id)
+                .limit(k)
+            )
+
+        candidates = (
+            select(HistoricalEvent.id)
+            .where(*conditions)
+            .order_by(knn)
+            .limit(k * NEAR_CANDIDATE_FACTOR)
+            .subquery()
+        )
+        distance = func.ST_Distance(
+            cast(HistoricalEvent.location, Geography(srid=4326)), cast(point, Geography(srid=4326))
+        ).label("distance_m")
+        return (
+            select(*cls._event_columns(), distance)
+            .join(candidates, candidates.c.id == HistoricalEvent.id)
+            .order_by(distance, HistoricalEvent.id)
+            .limit(k)
+        )
+
+    @classmethod
+    def _features_query(
+        cls,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ):
+        conditions = cls._window_conditions(start_year, end_year, continent, bbox)
+        stmt = select(cls._feature_text(fields))
+        if max_features:
+            return cls._sampled(stmt, conditions, zoom, max_features)
+        return stmt.where(*conditions)
+
+    @classmethod
+    def _playback_query(
+        cls,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        after: Optional[int] = None
+    ):
+        """
+        Eventos que tocam um trecho da reprodução, já como Feature em texto, na
+        ordem de entrada. `after` pula os que começam até esse ano (lidos no trecho anterior).
+        """
+        year_last = func.greatest(
+            HistoricalEvent.year_start, func.coalesce(HistoricalEvent.year_end, HistoricalEvent.year_start)
+        )
+        stmt = (
+            select(
+                HistoricalEvent.year_start,
+                year_last.label("year_last"),
+                HistoricalEvent.id,
+                cls._feature_text(fields).label("feature")
+            )
+            .where(*cls._window_conditions(start_year, end_year, continent))
+            .order_by(HistoricalEvent.year_start, HistoricalEvent.id)
+        )
+        if after is not None:
+            stmt = stmt.where(HistoricalEvent.year_start > after)
+        return stmt
+
+    @classmethod
+    def _columns_query(
+        cls,
+        start_year: int,
+        end_year: int,
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        fields: Optional[List[str]] = None,
+        zoom: Optional[int] = None,
+        max_features: Optional[int] = None
+    ):
+        columns = [
+            HistoricalEvent.id,
+            func.ST_X(HistoricalEvent.location).label("lon"),
+            func.ST_Y(HistoricalEvent.location).label("lat")
+        ]
+        for name in fields or FEATURE_PROPERTIES:
+            if name == "id":
+                continue
+            column = FEATURE_PROPERTIES[name]
+            if name == "source":
+                column = cast(column, String)
+            columns.append(column.label(name))
+
+        conditions = cls._window_conditions(start_year, end_year, continent, bbox)
+        if max_features:
+            return cls._sampled(select(*columns), conditions, zoom, max_features)
+        return select(*columns).where(*conditions)
+
+    @staticmethod
+    def _rows_to_columns(keys: List[str], rows) -> Dict[str, list]:
+        if not rows:
+            return {key: [] for key in keys}
+        return {key: list(values) for key, values in zip(keys, zip(*rows))}
+
+    @classmethod
+    def _cluster_columns(cls, rows) -> Dict[str, list]:
+        keys = ["id", "lon", "lat", "point_count", "name", "year", "continent"]
+        return cls._rows_to_columns(keys, [
+            (r.rep_id, r.lon, r.lat, r.point_count, r.name, r.year_start, r.continent) for r in rows
+        ])
+
+    @classmethod
+    def _facets_query(cls, start_year: Optional[int] = None, end_year: Optional[int] = None):
+        source = cast(HistoricalEvent.source, String)
+        stmt = select(
+            HistoricalEvent.continent,
+            HistoricalEvent.period,
+            source.label("source"),
+            func.grouping(HistoricalEvent.continent).label("by_continent"),
+            func.grouping(HistoricalEvent.period).label("by_period"),
+            func.count().label("total")
+        ).group_by(func.grouping_sets(HistoricalEvent.continent, HistoricalEvent.period, source))
+
+        if start_year is not None or end_year is not None:
+            stmt = stmt.where(*cls._window_conditions(start_year, end_year))
+        return stmt
+
+    @staticmethod
+    def _facets_from_rows(rows) -> dict:
+        counts = {"continents": {}, "periods": {}, "sources": {}}
+        for row in rows:
+            # GROUPING(col) = 0 indica qual conjunto gerou a linha
+            if row.by_continent == 0:
+                facet, value = "continents", row.continent
+            elif row.by_period == 0:
+                facet, value = "periods", row.period
+            else:
+                facet, value = "sources", row.source
+            if value:
+                counts[facet][value] = row.total
+
+        return {
+            "continents": sorted(counts["continents"]),
+            "periods": sorted(counts["periods"]),
+            "sources": sorted(counts["sources"]),
+            "counts": counts
+        }
+
+    @staticmethod
+    def _clusters_query(conditions: list, zoom: int):
+        cell_size = EventService._cell_size(zoom)
+
+        cell_x = func.floor(func.ST_X(HistoricalEvent.location) / cell_size)
+        cell_y = func.floor(func.ST_Y(HistoricalEvent.location) / cell_size)
+        centroid = func.ST_Centroid(func.ST_Collect(HistoricalEvent.location))
+        representative = func.array_agg(
+            aggregate_order_by(HistoricalEvent.id, HistoricalEvent.year_start, HistoricalEvent.id)
+        )[1]
+
+        clusters = (
+            select(
+                func.count().label("point_count"),
+                func.ST_X(centroid).label("lon"),
+                func.ST_Y(centroid).label("lat"),
+                representative.label("rep_id")
+            )
+            .where(*conditions)
+            .group_by(cell_x, cell_y)
+            .subquery()
+        )
+
+        return select(
+            clusters,
+            HistoricalEvent.name,
+            HistoricalEvent.year_start,
+            HistoricalEvent.continent
+        ).join(HistoricalEvent, HistoricalEvent.id == clusters.c.rep_id)
+
+    @staticmethod
+    def _cell_size(zoom: int) -> float:
+        """Lado da célula de agrupamento em graus (largura do mundo em pixels = 256 * 2^zoom)."""
+        return 360.0 / (256 * 2 ** zoom) * CLUSTER_CELL_PX
+
+    @classmethod
+    def _sampled(cls, stmt, conditions: list, zoom: Optional[int], max_features: int):
+        """
+        Nível de detalhe: só os `max_features` eventos mais importantes de cada
+        célula da grade do zoom (a mesma dos clusters); sem zoom, os N mais
+        importantes da janela inteira. A saída vem por posição no ranking
+        (o 1º de cada célula, depois o 2º...), então os mais relevantes chegam antes.
+        """
+        partition = None
+        if zoom is not None:
+            cell_size = cls._cell_size(zoom)
+            partition = [
+                func.floor(func.ST_X(HistoricalEvent.location) / cell_size),
+                func.floor(func.ST_Y(HistoricalEvent.location) / cell_size)
+            ]
+
+        ranked = (
+            select(
+                HistoricalEvent.id,
+                func.row_number().over(
+                    partition_by=partition,
+                    order_by=(HistoricalEvent.importance.desc(), HistoricalEvent.id)
+                ).label("lod_rank")
+            )
+            .where(*conditions)
+            .subquery("ranked")
+        )
+        return (
+            stmt.join_from(HistoricalEvent, ranked, ranked.c.id == HistoricalEvent.id)
+            .where(ranked.c.lod_rank <= max_features)
+            .order_by(ranked.c.lod_rank, HistoricalEvent.importance.desc(), HistoricalEvent.id)
+        )
+
+    @staticmethod
+    def _cluster_feature(row) -> EventGeoFeature:
+        return EventGeoFeature(
+            geometry={"type": "Point", "coordinates": [row.lon, row.lat]},
+            properties={
+                "cluster": row.point_count > 1,
+                "point_count": row.point_count,
+                "id": row.rep_id,
+                "name": row.name,
+                "year": row.year_start,
+                "continent": row.continent
+            }
+        )
+
     # ========================================================================
     # MÉTODOS PRIVADOS
     # ========================================================================
 
-    def _find_existing(self, name: str, year: int) -> Optional[HistoricalEvent]:
-        """Busca evento existente por nome e ano."""
-        return self.db.query(HistoricalEvent).filter(
-            HistoricalEvent.name.ilike(name),
-            HistoricalEvent.year_start == year
-        ).first()
+    @staticmethod
+    def _window_conditions(
+        start_year: Optional[int],
+        end_year: Optional[int],
+        continent: Optional[str] = None,
+        bbox: Optional[BBox] = None
+    ) -> list:
+        """
+        Monta os filtros comuns às consultas do mapa (ano, continente e viewport).
+        O filtro de ano é sobreposição de intervalos: uma guerra de 1939 a 1945
+        aparece em qualquer janela que toque esse período.
+        Um limite ausente (None) deixa a janela aberta daquele lado.
+        """
+        if start_year is not None and end_year is not None and start_year > end_year:
+            # Janela vazia (int4range recusaria o intervalo invertido)
+            return [false()]
+
+        conditions = [
+            HistoricalEvent.year_span().op("&&")(
+                func.int4range(
+                    start_year if start_year is not None else null(),
+                    end_year if end_year is not None else null(),
+                    literal_column("'[]'")
+                )
+            )
+        ]
+
+        if continent and continent != "Todos":
+            conditions.append(HistoricalEvent.continent == continent)
+
+        if bbox:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if min_lon <= max_lon:
+                envelopes = [(min_lon, min_lat, max_lon, max_lat)]
+            else:
+                # Viewport cruzando a antimeridiana vira dois retângulos
+                envelopes = [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+
+            # ST_Intersects usa o índice GiST de `location`
+            conditions.append(or_(*[
+                func.ST_Intersects(HistoricalEvent.location, func.ST_MakeEnvelope(*env, 4326))
+                for env in envelopes
+            ]))
+
+        return conditions
 
-    def _handle_existing(self, existing: HistoricalEvent, new_data: EventCreate) -> dict:
+    def _clustered_features(self, conditions: list, zoom: int) -> List[EventGeoFeature]:
         """
-        Lida com evento duplicado.
-        Regra: Se o existente for MANUAL e o novo vier de automação (Wiki/Kaggle), 
-        geralmente não sobrescrevemos, a menos que queiramos enriquecer dados.
-        Aqui mantemos a lógica de atualizar se necessário.
+        Agrupa os eventos em uma grade proporcional ao zoom, direto no PostGIS.
+        O evento representativo de cada célula é o mais antigo dela.
         """
-        # Exemplo de regra: Atualiza se o dado novo for mais completo
-        # ou se quisermos forçar a atualização da fonte.
-        
-        # Se for seed ou wikidata tentando sobrescrever manual, podemos bloquear ou permitir
-        # Neste caso, vamos permitir atualização simples de conteúdo se for maior
-        if new_data.content and len(new_data.content) > len(existing.content or ""):
-            existing.content = new_data.content
-            existing.continent = new_data.continent # Atualiza continente caso tenha melhorado
-            self.db.commit()
-            return {"status": "updated", "id": existing.id}
-        
-        return {"status": "skipped", "id": existing.id}
+        rows = self.db.execute(self._clusters_query(conditions, zoom)).all()
+        return [self._cluster_feature(row) for row in rows]
 
-    def _create_new(self, event_data: EventCreate) -> dict:
-        """Cria novo evento."""
-        period = event_data.period or calculate_period(event_data.year_start)
-        
-        # Cria o ponto WKT para o PostGIS
-        wkt = f"SRID=4326;POINT({event_data.longitude} {event_data.latitude})"
-        
-        # Se o frontend mandou continente, usa. Se não, tenta detectar aqui também.
-        continent_val = event_data.continent
-        if not continent_val or continent_val == "Outro":
-             continent_val = self.detect_continent(event_data.latitude, event_data.longitude)
+    @staticmethod
+    def _feature_json(fields: Optional[List[str]] = None):
+        """
+        Expressão SQL que produz a mesma Feature de _to_geo_feature.
+        Só as colunas das properties pedidas entram no SELECT.
+        """
+        names = ["id"] + [f for f in (fields or FEATURE_PROPERTIES) if f != "id"]
+        properties = []
+        for name in names:
+            properties += [name, FEATURE_PROPERTIES[name]]
 
-        event = HistoricalEvent(
-            name=event_data.name,
-            description=event_data.description,
-            content=event_data.content,
-            year_start=event_data.year_start,
-            year_end=event_data.year_end,
-            continent=continent_val,
-            period=period,
-            source=EventSource(event_data.source),
-            location=wkt
+        return func.json_build_object(
+            "type", "Feature",
+            "geometry", cast(func.ST_AsGeoJSON(HistoricalEvent.location), JSON),
+            "properties", func.json_build_object(*properties)
         )
-        
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-        
-        return {"status": "created", "id": event.id, "name": event.name}
+
+    @classmethod
+    def _feature_text(cls, fields: Optional[List[str]] = None):
+        """
+        Feature como texto. Com todas as properties lê a coluna pré-serializada
+        `geojson_feature` (só cópia de bytes); o json_build_object fica para
+        projeções com `fields` e para linhas ainda sem a coluna preenchida.
+        """
+        if fields:
+            return cast(cls._feature_json(fields), Text)
+        return func.coalesce(HistoricalEvent.geojson_feature, cast(cls._feature_json(), Text))
+
+    def _find_existing(self, event_data: EventCreate) -> Optional[int]:
+        """Busca o id do evento com a mesma chave natural (usa ux_events_natural_key)."""
+        return self.db.execute(
+            select(HistoricalEvent.id).where(
+                HistoricalEvent.name_key == HistoricalEvent.normalize_name(event_data.name),
+                HistoricalEvent.year_start == event_data.year_start,
+                HistoricalEvent.external_id == (event_data.external_id or "")
+            )
+        ).scalar()
 
     def _to_response(self, event: HistoricalEvent) -> EventResponse: 
         """Converte modelo SQLAlchemy para Pydantic Response."""
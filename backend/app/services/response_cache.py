@@ -0,0 +1,141 @@
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from ..config import get_settings
+
+settings = get_settings()
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    media_type: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class _TeeBuffer:
+    """Acumula os chunks de um stream até estourar o limite por entrada (aí desiste)."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.chunks = []
+
+    def add(self, chunk: bytes):
+        if self.chunks is None:
+            return
+        self.size += len(chunk)
+        if self.size <= self.limit:
+            self.chunks.append(chunk)
+        else:
+            self.chunks = None
+
+
+class ResponseCache:
+    """
+    Cache LRU em memória para as rotas de leitura de eventos.
+    As chaves incluem a versão global dos dados: qualquer escrita em `events`
+    chama bump_version() e tudo que foi cacheado antes deixa de ser servido.
+    A versão leva um id aleatório do boot, então um ETag emitido antes de um
+    restart nunca volta a casar (e a dar 304) no processo novo.
+    O limite é por quantidade de entradas e por bytes totais.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, max_entry_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._boot_id = uuid.uuid4().hex[:12]
+        self._version = 1
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump_version(self):
+        """Invalida o cache inteiro. Chamado por toda escrita em `events`."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._size = 0
+
+    def make_key(self, *parts: str) -> str:
+        """Chave = versão atual + partes que identificam a resposta (rota, parâmetros...)."""
+        return self._prefix() + "|".join(parts)
+
+    def etag(self, key: str) -> str:
+        """ETag fraco derivado da chave (que já carrega a versão dos dados)."""
+        return 'W/"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        size = len(entry.body)
+        if size > self.max_entry_bytes or not key.startswith(self._prefix()):
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.body)
+
+            self._entries[key] = entry
+            self._size += size
+
+            # Evicção LRU: remove os menos usados até caber nos limites
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def tee(self, key: str, chunks: Iterator[bytes], media_type: str) -> Iterator[bytes]:
+        """
+        Repassa um stream ao cliente e, se ele terminar sem erro e couber no
+        limite por entrada, guarda o corpo completo no cache.
+        """
+        buffer = _TeeBuffer(self.max_entry_bytes)
+        for chunk in chunks:
+            buffer.add(chunk)
+            yield chunk
+        self._put_buffer(key, buffer, media_type)
+
+    async def atee(self, key: str, chunks: AsyncIterator[bytes], media_type: str) -> AsyncIterator[bytes]:
+        """Mesmo que tee(), para streams assíncronos."""
+        buffer = _TeeBuffer(self.max_entry_bytes)
+        async for chunk in chunks:
+            buffer.add(chunk)
+            yield chunk
+        self._put_buffer(key, buffer, media_type)
+
+    def _prefix(self) -> str:
+        return f"v{self._boot_id}.{self._version}|"
+
+    def _put_buffer(self, key: str, buffer: "_TeeBuffer", media_type: str):
+        if buffer.chunks is not None:
+            self.put(key, CachedResponse(b"".join(buffer.chunks), media_type))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "bytes": self._size
+        }
+
+
+# Instância global para ser importada
+response_cache = ResponseCache(
+    max_entries=settings.cache_max_entries,
+    max_bytes=settings.cache_max_bytes,
+    max_entry_bytes=settings.cache_max_entry_bytes
+)
@@ -35,6 +35,11 @@ class TaskManager:
         if task_id in self._tasks:
             self._tasks[task_id]["status"] = status
 
+    def set_progress(self, task_id: str, progress: int):
+        """Percentual concluído (0-100), para barras de progresso."""
+        if task_id in self._tasks:
+            self._tasks[task_id]["progress"] = max(0, min(100, int(progress)))
+
     def get_task(self, task_id: str) -> Optional[Dict]:
         """Retorna os dados da tarefa para o Frontend."""
         return self._tasks.get(task_id)
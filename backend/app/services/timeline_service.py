@@ -0,0 +1,72 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Numeric, cast, func, literal_column, select
+from typing import Optional
+
+from ..models import EventYearCount
+
+
+class TimelineService:
+    """Estatísticas da linha do tempo lidas do resumo pré-agregado `event_year_counts`."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def histogram(
+        self,
+        bucket: int = 10,
+        continent: Optional[str] = None,
+        source: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None
+    ) -> dict:
+        """
+        Quantidade de eventos por faixa de `bucket` anos (pelo ano de início),
+        com a quebra por continente e fonte de cada faixa.
+        """
+        # Literal (e não bind param) para o GROUP BY casar com a expressão do SELECT;
+        # floor() em vez de divisão inteira para anos negativos caírem na faixa certa
+        size = literal_column(str(int(bucket)))
+        bucket_start = (func.floor(EventYearCount.year / cast(size, Numeric)) * size).label("bucket_start")
+        stmt = (
+            select(
+                bucket_start,
+                EventYearCount.continent,
+                EventYearCount.source,
+                func.sum(EventYearCount.total).label("total")
+            )
+            .where(EventYearCount.total > 0)
+            .group_by(bucket_start, EventYearCount.continent, EventYearCount.source)
+            .order_by(bucket_start)
+        )
+
+        if continent and continent != "Todos":
+            stmt = stmt.where(EventYearCount.continent == continent)
+        if source:
+            stmt = stmt.where(EventYearCount.source == source)
+        if start_year is not None:
+            stmt = stmt.where(EventYearCount.year >= start_year)
+        if end_year is not None:
+            stmt = stmt.where(EventYearCount.year <= end_year)
+
+        buckets = {}
+        for row in self.db.execute(stmt):
+            start = int(row.bucket_start)
+            entry = buckets.setdefault(start, {
+                "start": start,
+                "end": start + bucket - 1,
+                "count": 0,
+                "continents": {},
+                "sources": {}
+            })
+            total = int(row.total)
+            entry["count"] += total
+            if row.continent:
+                entry["continents"][row.continent] = entry["continents"].get(row.continent, 0) + total
+            if row.source:
+                entry["sources"][row.source] = entry["sources"].get(row.source, 0) + total
+
+        return {
+            "bucket": bucket,
+            "total": sum(b["count"] for b in buckets.values()),
+            "buckets": list(buckets.values())
+        }
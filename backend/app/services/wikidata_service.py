@@ -19,6 +19,7 @@ class WikidataEvent:
     longitude: float
     continent: str
     period: str
+    sitelinks: Optional[int] = None
 
 class WikidataService:
     CONTINENT_MAP = {
@@ -110,7 +111,7 @@ class WikidataService:
     def _build_query(self, continent_id: str, start_year: int, end_year: int) -> str:
         """Query fiel ao formato que funciona no Wikidata Query Service."""
         return f"""
-        SELECT DISTINCT ?item ?itemLabel ?itemDescription ?start ?end ?coord ?article WHERE {{                                            
+        SELECT DISTINCT ?item ?itemLabel ?itemDescription ?start ?end ?coord ?article ?sitelinks WHERE {{                                            
           ?item wdt:P585|wdt:P580 ?date .
           FILTER(YEAR(?date) >= {start_year} && YEAR(?date) < {end_year})        
           VALUES ?type {{ 
@@ -127,6 +128,7 @@ class WikidataService:
           OPTIONAL {{ ?item wdt:P17/wdt:P625 ?loc3 .}}
           BIND(COALESCE(?loc1, ?loc2, ?loc3) AS ?coord)            
           FILTER(BOUND(?coord))                                     
+          OPTIONAL {{ ?item wikibase:sitelinks ?sitelinks .}}
                                                                     
           MINUS {{ ?item wdt:P31/wdt:P279* wd:Q3863 .}} 
           MINUS {{ ?item wdt:P31/wdt:P279* wd:Q44235 .}}
@@ -163,11 +165,13 @@ class WikidataService:
             article_url = item.get("article", {}).get("value", "")
             content = self.get_wiki_summary(article_url) if article_url else None
             description = item.get("itemDescription", {}).get("value", "Evento Histórico")
+            sitelinks = item.get("sitelinks", {}).get("value")
 
             return WikidataEvent(
                 name=str(name), description=str(description), content=content or description,
                 year_start=year_start, year_end=year_start, latitude=coords[0], longitude=coords[1],
-                continent=continent, period=calculate_period(year_start)
+                continent=continent, period=calculate_period(year_start),
+                sitelinks=int(sitelinks) if sitelinks else None
             )
         except Exception:
             return None
\ No newline at end of file
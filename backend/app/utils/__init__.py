@@ -1,4 +1,4 @@
 from .helpers import calculate_period, format_year_display
-from .spatial import get_continent_from_coords
+from .spatial import get_continent_from_coords, detect_continents, parse_bbox
 
-__all__ = ['calculate_period', 'format_year_display', 'get_continent_from_coords']
\ No newline at end of file
+__all__ = ['calculate_period', 'format_year_display', 'get_continent_from_coords', 'detect_continents', 'parse_bbox']
\ No newline at end of file
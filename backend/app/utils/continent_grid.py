@@ -0,0 +1,147 @@
+"""
+Grade pré-calculada de continentes (lookup O(1) por ponto).
+Cada célula de GRID_RESOLUTION graus guarda um uint8: 0 = nenhum continente,
+1..254 = índice+1 do polígono (ordem de id), 255 = célula de borda ("mista"),
+que cai no teste exato contra os polígonos. O arquivo é gerado por
+scripts/build_continent_grid.py e mapeado em memória (np.memmap) no startup.
+"""
+import json
+import os
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import shapely
+
+GRID_RESOLUTION = 0.05
+NO_CONTINENT = 0
+MIXED = 255
+
+# Blocos com até esta quantidade de células são classificados de forma vetorizada
+LEAF_CELLS = 4096
+
+
+class ContinentGrid:
+    """Grade carregada (memmap) + metadados do arquivo .json ao lado."""
+
+    def __init__(self, codes: np.ndarray, names: List[str], resolution: float):
+        self.codes = codes
+        self.names = names
+        self.resolution = resolution
+        self.rows, self.cols = codes.shape
+
+    def lookup(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Código da célula de cada ponto (linha 0 = lat 90, coluna 0 = lon -180)."""
+        rows = np.clip(((90.0 - lats) / self.resolution).astype(np.int64), 0, self.rows - 1)
+        cols = np.clip(((lons + 180.0) / self.resolution).astype(np.int64), 0, self.cols - 1)
+        return self.codes[rows, cols]
+
+    def lookup_one(self, lat: float, lon: float) -> int:
+        row = min(max(int((90.0 - lat) / self.resolution), 0), self.rows - 1)
+        col = min(max(int((lon + 180.0) / self.resolution), 0), self.cols - 1)
+        return int(self.codes[row, col])
+
+
+def grid_shape(resolution: float = GRID_RESOLUTION):
+    return int(round(180 / resolution)), int(round(360 / resolution))
+
+
+def build_grid(
+    geoms: Sequence,
+    resolution: float = GRID_RESOLUTION,
+    progress: Optional[Callable[[float], None]] = None
+) -> np.ndarray:
+    """
+    Gera a grade por quadtree: um bloco inteiro dentro de um único polígono (ou
+    fora de todos) é preenchido de uma vez; só os blocos que cruzam bordas são
+    subdivididos, até virarem folhas classificadas célula a célula.
+    """
+    if len(geoms) >= MIXED:
+        raise ValueError(f"A grade suporta até {MIXED - 1} polígonos")
+
+    geoms = np.asarray(geoms, dtype=object)
+    shapely.prepare(geoms)
+    tree = shapely.STRtree(geoms)
+    rows, cols = grid_shape(resolution)
+    codes = np.zeros((rows, cols), dtype=np.uint8)
+    total = rows * cols
+    done = [0]
+
+    def bounds(r0, r1, c0, c1):
+        return (-180.0 + c0 * resolution, 90.0 - r1 * resolution, -180.0 + c1 * resolution, 90.0 - r0 * resolution)
+
+    def finish(cells):
+        done[0] += cells
+        if progress:
+            progress(done[0] / total)
+
+    def leaf(r0, r1, c0, c1, candidates):
+        rr, cc = np.mgrid[r0:r1, c0:c1]
+        boxes = shapely.box(
+            -180.0 + cc * resolution, 90.0 - (rr + 1) * resolution,
+            -180.0 + (cc + 1) * resolution, 90.0 - rr * resolution
+        )
+        hits = np.zeros(boxes.shape, dtype=np.int32)
+        inside = np.zeros(boxes.shape, dtype=np.int32)
+        for i in candidates:
+            touching = shapely.intersects(geoms[i], boxes)
+            hits += touching
+            inside = np.where(touching & shapely.contains(geoms[i], boxes), i + 1, inside)
+        codes[r0:r1, c0:c1] = np.where(hits == 0, NO_CONTINENT, np.where((hits == 1) & (inside > 0), inside, MIXED))
+
+    stack = [(0, rows, 0, cols)]
+    while stack:
+        r0, r1, c0, c1 = stack.pop()
+        block = shapely.box(*bounds(r0, r1, c0, c1))
+        candidates = [i for i in sorted(tree.query(block)) if shapely.intersects(geoms[i], block)]
+        cells = (r1 - r0) * (c1 - c0)
+
+        if not candidates:
+            finish(cells)
+            continue
+        if len(candidates) == 1 and shapely.contains(geoms[candidates[0]], block):
+            codes[r0:r1, c0:c1] = candidates[0] + 1
+            finish(cells)
+            continue
+        if cells <= LEAF_CELLS:
+            leaf(r0, r1, c0, c1, candidates)
+            finish(cells)
+            continue
+
+        # Divide ao meio na dimensão maior
+        if r1 - r0 >= c1 - c0:
+            mid = (r0 + r1) // 2
+            stack += [(r0, mid, c0, c1), (mid, r1, c0, c1)]
+        else:
+            mid = (c0 + c1) // 2
+            stack += [(r0, r1, c0, mid), (r0, r1, mid, c1)]
+
+    return codes
+
+
+def save_grid(path: str, codes: np.ndarray, names: List[str], signature: str, resolution: float = GRID_RESOLUTION):
+    """Grava a grade crua (.u8) e os metadados (.json) usados para validar a carga."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    codes.tofile(path)
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump({
+            "signature": signature,
+            "names": names,
+            "resolution": resolution,
+            "shape": list(codes.shape)
+        }, f, ensure_ascii=False)
+
+
+def load_grid(path: str, signature: str) -> Optional[ContinentGrid]:
+    """Mapeia a grade do disco; None se não existir ou tiver sido gerada de outros polígonos."""
+    try:
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("signature") != signature:
+        print("⚠️ Grade de continentes desatualizada (polígonos mudaram); rode scripts/build_continent_grid.py")
+        return None
+
+    codes = np.memmap(path, dtype=np.uint8, mode="r", shape=tuple(meta["shape"]))
+    return ContinentGrid(codes, meta["names"], meta["resolution"])
@@ -0,0 +1,183 @@
+import threading
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from sqlalchemy import text
+
+from ..config import get_settings
+from .continent_grid import ContinentGrid, MIXED, NO_CONTINENT, load_grid
+
+settings = get_settings()
+
+# Rótulos compartilhados com a detecção via PostGIS
+UNKNOWN = "Desconhecido"
+NO_MATCH = "Oceano / Outro"
+
+# Muda sempre que um polígono é inserido, removido ou alterado
+SIGNATURE_SQL = text("""
+    SELECT coalesce(md5(string_agg(id || ':' || name || ':' || md5(ST_AsBinary(geom)), ',' ORDER BY id)), '')
+    FROM settings.continents_shapes
+""")
+
+SHAPES_SQL = text("SELECT name, ST_AsBinary(geom) AS wkb FROM settings.continents_shapes ORDER BY id")
+
+
+class ContinentIndex:
+    """
+    Índice em memória dos polígonos de `settings.continents_shapes`.
+    Primeiro consulta a grade pré-calculada (ContinentGrid, se o arquivo existir e
+    bater com os polígonos); só células de borda, ou tudo quando não há grade,
+    vão para o teste exato com os polígonos preparados (shapely.prepare) numa
+    STRtree, montada sob demanda. A cada `continent_index_ttl_seconds` uma
+    assinatura (md5 dos polígonos) é conferida e o índice é recarregado se a tabela mudou.
+    """
+
+    def __init__(self, ttl_seconds: float, use_grid: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.use_grid = use_grid
+        self._names: List[str] = []
+        self._wkbs: List[bytes] = []
+        self._grid: Optional[ContinentGrid] = None
+        self._geoms = np.empty(0, dtype=object)
+        self._bounds: List[tuple] = []
+        self._tree: Optional[STRtree] = None
+        self._signature: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # ========================================================================
+    # RECARGA
+    # ========================================================================
+
+    def needs_check(self) -> bool:
+        return self._signature is None or time.monotonic() - self._checked_at >= self.ttl_seconds
+
+    def is_current(self, signature: str) -> bool:
+        return self._signature is not None and signature == self._signature
+
+    def mark_checked(self):
+        self._checked_at = time.monotonic()
+
+    def load(self, signature: str, rows: Sequence):
+        """
+        Troca os polígonos a partir de linhas (name, wkb). A grade é só mapeada
+        do disco; os polígonos são parseados na primeira célula mista.
+        """
+        names = [row.name for row in rows]
+        grid = load_grid(settings.continent_grid_path, signature) if self.use_grid else None
+        if grid is not None and grid.names != names:
+            grid = None
+
+        with self._lock:
+            self._names, self._wkbs, self._grid = names, [bytes(row.wkb) for row in rows], grid
+            self._geoms, self._tree, self._bounds = np.empty(0, dtype=object), None, []
+            self._signature = signature
+            self._checked_at = time.monotonic()
+        print(f"🗺️ Índice de continentes carregado ({len(names)} polígonos, grade {'ok' if grid else 'ausente'})")
+
+    def _polygons(self):
+        """(árvore, geometrias preparadas, bboxes), parseados na primeira necessidade."""
+        with self._lock:
+            if self._tree is None:
+                geoms = shapely.from_wkb(self._wkbs) if self._wkbs else np.empty(0, dtype=object)
+                shapely.prepare(geoms)
+                self._geoms, self._tree = geoms, STRtree(geoms)
+                self._bounds = [tuple(b) for b in shapely.bounds(geoms).tolist()]
+            return self._tree, self._geoms, self._bounds
+
+    def ensure_fresh(self, db):
+        """Confere a assinatura (no máximo uma vez por TTL) e recarrega se preciso."""
+        if not self.needs_check():
+            return
+        signature = db.execute(SIGNATURE_SQL).scalar()
+        if self.is_current(signature):
+            self.mark_checked()
+        else:
+            self.load(signature, db.execute(SHAPES_SQL).all())
+
+    async def ensure_fresh_async(self, db):
+        """ensure_fresh sobre uma AsyncSession."""
+        if not self.needs_check():
+            return
+        signature = (await db.execute(SIGNATURE_SQL)).scalar()
+        if self.is_current(signature):
+            self.mark_checked()
+        else:
+            self.load(signature, (await db.execute(SHAPES_SQL)).all())
+
+    def invalidate(self):
+        """Força a conferência da assinatura na próxima detecção (ex: após o seed)."""
+        self._checked_at = 0.0
+
+    # ========================================================================
+    # DETECÇÃO
+    # ========================================================================
+
+    def detect(self, lat: float, lon: float) -> str:
+        """Um ponto só: célula da grade; se mista, testa as bboxes e chama o GEOS nos candidatos."""
+        if lat is None or lon is None or lat != lat or lon != lon or (lat == 0 and lon == 0):
+            return UNKNOWN
+
+        grid, names = self._grid, self._names
+        if grid is not None:
+            code = grid.lookup_one(lat, lon)
+            if code == NO_CONTINENT:
+                return NO_MATCH
+            if code != MIXED:
+                return names[code - 1]
+
+        _, geoms, bounds = self._polygons()
+        for i, (min_x, min_y, max_x, max_y) in enumerate(bounds):
+            if min_x <= lon <= max_x and min_y <= lat <= max_y and shapely.intersects_xy(geoms[i], lon, lat):
+                return names[i]
+        return NO_MATCH
+
+    def detect_many(self, lats: Sequence[float], lons: Sequence[float]) -> List[str]:
+        """
+        Continente de cada ponto, na ordem de entrada. Mesmos rótulos da consulta
+        PostGIS: (0, 0) ou coordenada ausente = 'Desconhecido', fora de todos os
+        polígonos = 'Oceano / Outro'. Em empate (fronteira), vale o polígono de menor id.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        labels = np.full(len(lats), NO_MATCH, dtype=object)
+
+        unknown = np.isnan(lats) | np.isnan(lons) | ((lats == 0) & (lons == 0))
+        labels[unknown] = UNKNOWN
+
+        grid, names = self._grid, self._names
+        candidates = np.flatnonzero(~unknown)
+        if not len(candidates) or not names:
+            return labels.tolist()
+
+        if grid is not None:
+            codes = grid.lookup(lats[candidates], lons[candidates])
+            solved = (codes != MIXED)
+            lookup = np.array([NO_MATCH] + names, dtype=object)
+            labels[candidates[solved]] = lookup[codes[solved]]
+            candidates = candidates[~solved]
+            if not len(candidates):
+                return labels.tolist()
+
+        tree, geoms, _ = self._polygons()
+        points = shapely.points(lons[candidates], lats[candidates])
+        # 1) bbox na STRtree; 2) teste exato com os polígonos preparados, vetorizado
+        point_idx, geom_idx = tree.query(points)
+        hits = shapely.intersects(geoms[geom_idx], points[point_idx])
+        point_idx, geom_idx = point_idx[hits], geom_idx[hits]
+
+        # Menor índice de polígono por ponto (mesma ordem do SELECT ... ORDER BY id)
+        order = np.lexsort((geom_idx, point_idx))
+        point_idx, geom_idx = point_idx[order], geom_idx[order]
+        first = np.unique(point_idx, return_index=True)[1]
+        for p, g in zip(point_idx[first], geom_idx[first]):
+            labels[candidates[p]] = names[g]
+
+        return labels.tolist()
+
+
+# Instância global (por processo)
+continent_index = ContinentIndex(ttl_seconds=settings.continent_index_ttl_seconds)
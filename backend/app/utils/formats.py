@@ -0,0 +1,84 @@
+"""
+Formatos binários compactos da camada do mapa (GET /events).
+Os eventos saem em colunas (id, lon, lat, year, ...) em vez de uma Feature por
+ponto: sem chaves repetidas nem floats em texto. As libs são opcionais e só
+importadas quando o formato é pedido.
+"""
+import importlib
+from typing import Dict, List, Optional
+
+# formato -> (media type, módulo python necessário)
+BINARY_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "pyarrow"),
+    "msgpack": ("application/vnd.msgpack", "msgpack"),
+}
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+# Colunas de texto com poucos valores distintos (viram dicionário no Arrow)
+CATEGORICAL_COLUMNS = {"period", "continent", "source"}
+YEAR_COLUMNS = {"year", "year_end"}
+
+
+def negotiate_format(accept: str = "", format: Optional[str] = None) -> str:
+    """
+    Escolhe o formato pela query `format` (geojson/arrow/msgpack) ou pelo header Accept.
+    Lança ValueError se `format` for desconhecido.
+    """
+    if format:
+        if format != "geojson" and format not in BINARY_FORMATS:
+            raise ValueError(f"Formato desconhecido: {format}. Use geojson, {', '.join(BINARY_FORMATS)}")
+        return format
+
+    for name, (media_type, _) in BINARY_FORMATS.items():
+        if media_type in accept:
+            return name
+    return "geojson"
+
+
+def media_type_for(fmt: str) -> str:
+    return BINARY_FORMATS[fmt][0] if fmt in BINARY_FORMATS else GEOJSON_MEDIA_TYPE
+
+
+def ensure_available(fmt: str):
+    """Lança ImportError se a lib do formato não estiver instalada (a rota responde 406)."""
+    if fmt in BINARY_FORMATS:
+        module = BINARY_FORMATS[fmt][1]
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            raise ImportError(f"Formato '{fmt}' indisponível no servidor (instale '{module}')")
+
+
+def encode_columns(columns: Dict[str, List], fmt: str) -> bytes:
+    """Serializa {coluna: valores} (todas do mesmo tamanho) no formato binário pedido."""
+    if fmt == "arrow":
+        return _encode_arrow(columns)
+    if fmt == "msgpack":
+        import msgpack
+        # Floats de 32 bits bastam para coordenadas de mapa e cortam metade dos bytes
+        return msgpack.packb(columns, use_single_float=True)
+    raise ValueError(f"Formato sem codificação colunar: {fmt}")
+
+
+def _encode_arrow(columns: Dict[str, List]) -> bytes:
+    import pyarrow as pa
+
+    arrays = {}
+    for name, values in columns.items():
+        if name in ("lon", "lat"):
+            arrays[name] = pa.array(values, type=pa.float32())
+        elif name in YEAR_COLUMNS:
+            arrays[name] = pa.array(values, type=pa.int16())
+        elif name in ("id", "point_count"):
+            arrays[name] = pa.array(values, type=pa.int32())
+        elif name in CATEGORICAL_COLUMNS:
+            arrays[name] = pa.array(values, type=pa.string()).dictionary_encode()
+        else:
+            arrays[name] = pa.array(values)
+
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Tuple
 
 
 def calculate_period(year: int) -> str:
@@ -21,6 +21,34 @@ def format_year_display(year: int) -> str:
     return str(year)
 
 
+def encode_cursor(year: int, event_id: int) -> str:
+    """Serializa a posição (year_start, id) usada na paginação keyset."""
+    return f"{year}:{event_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Converte 'ano:id' de volta para tupla. Lança ValueError se inválido."""
+    try:
+        year, event_id = cursor.rsplit(":", 1)
+        return int(year), int(event_id)
+    except ValueError:
+        raise ValueError("cursor deve ter o formato 'ano:id'")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Converte o `since` do feed de mudanças ('seq' ou 'seq:id', ver GET /events/changes)
+    em tupla (change_seq, id). Lança ValueError se inválido.
+    """
+    try:
+        if ":" not in cursor:
+            return int(cursor), 0
+        seq, event_id = cursor.rsplit(":", 1)
+        return int(seq), int(event_id)
+    except ValueError:
+        raise ValueError("since deve ter o formato 'seq' ou 'seq:id'")
+
+
 def parse_wikidata_year(date_str: str) -> Optional[int]: 
     """Extrai ano de string de data Wikidata."""
     if not date_str: 
@@ -1,25 +1,106 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from typing import List, Sequence, Tuple
+
+from .continent_index import continent_index, UNKNOWN, NO_MATCH
+
+# Ponto -> nome do continente (ST_Intersects usa o índice GiST de geom)
+CONTINENT_SQL = text("""
+    SELECT name FROM settings.continents_shapes 
+    WHERE ST_Intersects(geom, ST_SetSRID(ST_Point(:lon, :lat), 4326))
+    LIMIT 1
+""")
 
 def get_continent_from_coords(db: Session, lat: float, lon: float) -> str:
     """
-    Função reutilizável para detectar continente via interseção espacial no PostGIS.
+    Função reutilizável para detectar continente.
+    Usa o índice em memória (ContinentIndex); o banco só é consultado para
+    conferir/recarregar os polígonos, ou como fallback se o índice falhar.
     """
     # Validação básica
     if lat is None or lon is None or (lat == 0 and lon == 0):
-        return "Desconhecido"
-
-    # Query otimizada usando ST_Intersects
-    sql = text("""
-        SELECT name FROM settings.continents_shapes 
-        WHERE ST_Intersects(geom, ST_SetSRID(ST_Point(:lon, :lat), 4326))
-        LIMIT 1
-    """)
-    
+        return UNKNOWN
+
+    try:
+        continent_index.ensure_fresh(db)
+        return continent_index.detect(float(lat), float(lon))
+    except Exception as e:
+        print(f"⚠️ Índice de continentes indisponível, usando PostGIS: {str(e)}")
+        return _continent_from_db(db, lat, lon)
+
+def detect_continents(db: Session, lats: Sequence[float], lons: Sequence[float]) -> List[str]:
+    """Versão vetorizada de get_continent_from_coords (mesmos rótulos, mesma ordem)."""
+    if not len(lats):
+        return []
+    try:
+        continent_index.ensure_fresh(db)
+        return continent_index.detect_many(lats, lons)
+    except Exception as e:
+        print(f"⚠️ Índice de continentes indisponível, usando PostGIS: {str(e)}")
+        return [get_continent_from_coords_db(db, lat, lon) for lat, lon in zip(lats, lons)]
+
+async def get_continent_from_coords_async(db, lat: float, lon: float) -> str:
+    """Mesma detecção de get_continent_from_coords, sobre uma AsyncSession."""
+    if lat is None or lon is None or (lat == 0 and lon == 0):
+        return UNKNOWN
+
+    try:
+        await continent_index.ensure_fresh_async(db)
+        return continent_index.detect(float(lat), float(lon))
+    except Exception as e:
+        print(f"⚠️ Índice de continentes indisponível, usando PostGIS: {str(e)}")
+        return await _continent_from_db_async(db, lat, lon)
+
+def get_continent_from_coords_db(db: Session, lat: float, lon: float) -> str:
+    """Detecção direto no PostGIS (ST_Intersects), sem o índice em memória."""
+    if lat is None or lon is None or (lat == 0 and lon == 0):
+        return UNKNOWN
+    return _continent_from_db(db, lat, lon)
+
+def _continent_from_db(db: Session, lat: float, lon: float) -> str:
     try:
         # Forçamos float
-        result = db.execute(sql, {"lon": float(lon), "lat": float(lat)}).fetchone()
-        return result[0] if result else "Oceano / Outro"
+        result = db.execute(CONTINENT_SQL, {"lon": float(lon), "lat": float(lat)}).fetchone()
+        return result[0] if result else NO_MATCH
     except Exception as e:
         print(f"⚠️ Erro Spatial Service: {str(e)}")
-        return "Erro na Detecção"
\ No newline at end of file
+        return "Erro na Detecção"
+
+async def _continent_from_db_async(db, lat: float, lon: float) -> str:
+    """_continent_from_db sobre uma AsyncSession."""
+    try:
+        result = (await db.execute(CONTINENT_SQL, {"lon": float(lon), "lat": float(lat)})).fetchone()
+        return result[0] if result else NO_MATCH
+    except Exception as e:
+        print(f"⚠️ Erro Spatial Service: {str(e)}")
+        return "Erro na Detecção"
+
+def parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """
+    Converte a string 'min_lon,min_lat,max_lon,max_lat' (formato do Leaflet
+    `map.getBounds().toBBoxString()`) em uma tupla validada.
+    min_lon > max_lon é aceito: significa que a viewport cruza a antimeridiana.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise ValueError("bbox deve ter o formato 'min_lon,min_lat,max_lon,max_lat'")
+
+    # Leaflet devolve longitudes fora de [-180, 180] quando o mapa "dá a volta"
+    if max_lon - min_lon >= 360:
+        min_lon, max_lon = -180.0, 180.0
+    else:
+        min_lon, max_lon = _wrap_lon(min_lon), _wrap_lon(max_lon)
+
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    if min_lat > max_lat:
+        raise ValueError("bbox inválido: min_lat maior que max_lat")
+
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _wrap_lon(lon: float) -> float:
+    """Traz uma longitude qualquer para o intervalo [-180, 180]."""
+    if -180 <= lon <= 180:
+        return lon
+    return ((lon + 180) % 360) - 180
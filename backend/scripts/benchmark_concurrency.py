@@ -0,0 +1,78 @@
+"""
+Benchmark de latência sob carga concorrente das rotas de leitura de /events.
+Rode uma vez com o servidor no modo síncrono e outra com ASYNC_DB_ENABLED=true
+para comparar o p99 antes/depois do caminho asyncpg.
+
+Uso (com a API no ar):
+    python scripts/benchmark_concurrency.py --concurrency 100 --requests 2000
+    python scripts/benchmark_concurrency.py --path "/events/filters" --no-cache
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_PATHS = [
+    "/events?start_year=1800&end_year=1900&profile=map",
+    "/events/all?limit=500",
+    "/events/filters?start_year=1500&end_year=2000",
+    "/events/detect-continent?lat=48.85&lon=2.35",
+]
+
+
+def percentile(values, p):
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run(base_url: str, path: str, total: int, concurrency: int, no_cache: bool):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def one(i: int):
+        url = base_url + path
+        if no_cache:
+            # Query string diferente = chave diferente no cache de respostas
+            url += ("&" if "?" in url else "?") + f"_bench={i}"
+        t0 = time.perf_counter()
+        try:
+            ok = session.get(url, timeout=60).status_code == 200
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - t0, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(t for t, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    print(
+        f"{path[:60]:<60} "
+        f"p50 {percentile(latencies, 50) * 1000:7.1f} ms | "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms | "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms | "
+        f"{total / elapsed:7.1f} req/s | erros {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="Rota a testar (repetível); padrão: rotas do mapa")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--no-cache", action="store_true", help="Força miss no cache de respostas")
+    args = parser.parse_args()
+
+    print(f"📊 {args.requests} requisições, {args.concurrency} simultâneas ({args.url})")
+    for path in args.path or DEFAULT_PATHS:
+        run(args.url, path, args.requests, args.concurrency, args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
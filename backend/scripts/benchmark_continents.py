@@ -0,0 +1,76 @@
+"""
+Benchmark da detecção de continentes: PostGIS (ST_Intersects por ponto),
+polígonos em memória (STRtree) e grade pré-calculada + polígonos nas células mistas.
+
+Uso (dentro de /backend, com o banco no ar e a grade gerada):
+    python scripts/benchmark_continents.py --points 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.utils.continent_grid import MIXED, load_grid  # noqa: E402
+from app.utils.continent_index import ContinentIndex, SHAPES_SQL, SIGNATURE_SQL  # noqa: E402
+from app.utils.spatial import get_continent_from_coords_db  # noqa: E402
+
+
+def measure(label, fn, count):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<22} {count / elapsed:14,.0f} pontos/s | {elapsed / count * 1e6:8.3f} µs/ponto")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--db-points", type=int, default=2_000, help="Amostra para o caminho PostGIS (lento)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    lats = rng.uniform(-85, 85, args.points)
+    lons = rng.uniform(-180, 180, args.points)
+
+    db = SessionLocal()
+    try:
+        signature = db.execute(SIGNATURE_SQL).scalar()
+        rows = db.execute(SHAPES_SQL).all()
+
+        n = min(args.db_points, args.points)
+        expected = measure(
+            "postgis",
+            lambda: [get_continent_from_coords_db(db, lat, lon) for lat, lon in zip(lats[:n], lons[:n])],
+            n
+        )
+    finally:
+        db.close()
+
+    polygons = ContinentIndex(ttl_seconds=3600, use_grid=False)
+    polygons.load(signature, rows)
+    exact = measure("polígonos (STRtree)", lambda: polygons.detect_many(lats, lons), args.points)
+
+    grid = load_grid(get_settings().continent_grid_path, signature)
+    if grid is None:
+        print("⚠️ Grade ausente ou desatualizada: rode scripts/build_continent_grid.py")
+        return
+
+    indexed = ContinentIndex(ttl_seconds=3600)
+    indexed.load(signature, rows)
+    fast = measure("grade + mistas", lambda: indexed.detect_many(lats, lons), args.points)
+
+    mixed = (grid.lookup(lats, lons) == MIXED).mean()
+    print(f"📊 células mistas na amostra: {mixed:.2%}")
+    print(f"✔️ grade == polígonos: {fast == exact} | polígonos == postgis (amostra): {exact[:n] == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark do GET /events: caminho antigo (ORM -> shapely -> Pydantic -> JSON)
+contra o caminho rápido (JSON montado no PostGIS e concatenado em bytes).
+
+Uso (dentro de /backend, com o banco no ar):
+    python scripts/benchmark_geojson.py --start -3000 --end 2025 --runs 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.event_service import EventService  # noqa: E402
+
+
+def run_legacy(service: EventService, start: int, end: int, continent):
+    collection = service.get_filtered(start, end, continent)
+    return collection.model_dump_json().encode("utf-8")
+
+
+def run_fast(service: EventService, start: int, end: int, continent):
+    return b"".join(service.stream_filtered(start, end, continent))
+
+
+def measure(label, fn, runs):
+    timings = []
+    payload = b""
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        payload = fn()
+        timings.append(time.perf_counter() - t0)
+
+    timings.sort()
+    print(
+        f"{label:<10} melhor {timings[0] * 1000:8.1f} ms | "
+        f"mediana {timings[len(timings) // 2] * 1000:8.1f} ms | "
+        f"{len(payload) / 1024:10.1f} KiB"
+    )
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=int, default=-10000)
+    parser.add_argument("--end", type=int, default=2100)
+    parser.add_argument("--continent", default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = EventService(db)
+        print(f"📊 GET /events {args.start}..{args.end} ({args.continent or 'Todos'}), {args.runs} execuções")
+
+        legacy = measure("pydantic", lambda: run_legacy(service, args.start, args.end, args.continent), args.runs)
+        fast = measure("postgis", lambda: run_fast(service, args.start, args.end, args.continent), args.runs)
+
+        print(f"⚡ Ganho: {legacy / fast:.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Gera a grade pré-calculada de continentes (data/continent_grid.u8 + .json)
+a partir de settings.continents_shapes. Rode de novo sempre que os polígonos
+mudarem: a API ignora a grade se a assinatura não bater.
+
+Uso (dentro de /backend, com o banco no ar):
+    python scripts/build_continent_grid.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shapely  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.utils.continent_grid import GRID_RESOLUTION, MIXED, build_grid, save_grid  # noqa: E402
+from app.utils.continent_index import SHAPES_SQL, SIGNATURE_SQL  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=get_settings().continent_grid_path)
+    parser.add_argument("--resolution", type=float, default=GRID_RESOLUTION)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        signature = db.execute(SIGNATURE_SQL).scalar()
+        rows = db.execute(SHAPES_SQL).all()
+    finally:
+        db.close()
+
+    if not rows:
+        print("⚠️ settings.continents_shapes está vazia; nada a gerar.")
+        return
+
+    names = [row.name for row in rows]
+    geoms = shapely.from_wkb([bytes(row.wkb) for row in rows])
+    print(f"🌐 Gerando grade de {args.resolution}° para {len(names)} polígonos...")
+
+    t0 = time.perf_counter()
+    last = [0]
+
+    def progress(fraction):
+        step = int(fraction * 10)
+        if step > last[0]:
+            last[0] = step
+            print(f"   {step * 10}%")
+
+    codes = build_grid(geoms, args.resolution, progress)
+    save_grid(args.output, codes, names, signature, args.resolution)
+
+    mixed = int((codes == MIXED).sum())
+    print(
+        f"✅ {args.output}: {codes.shape[0]}x{codes.shape[1]} células, "
+        f"{mixed / codes.size:.2%} mistas, {time.perf_counter() - t0:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,36 @@
 import requests
 
 API_URL = "http://localhost:8000/events"
-TARGET_NAME = "Queda de Roma"  # <--- O nome exato que você quer apagar
+TARGET_NAME = "Queda de Roma"  # <--- O nome que você quer apagar (ignora caixa e espaços extras)
 
 def delete_by_name():
     print(f"🔍 Procurando por: '{TARGET_NAME}'...")
-    
+
     try:
-        # 1. Busca todos os eventos para encontrar o ID correto
-        response = requests.get(f"{API_URL}/all")
-        events = response.json()
+        # 1. Dry-run: o servidor só conta quantos eventos casam com o filtro
+        response = requests.delete(API_URL, params={"name": TARGET_NAME, "dry_run": "true"})
+        response.raise_for_status()
+        matched = response.json()["matched"]
     except Exception as e:
         print(f"❌ Erro ao conectar na API: {e}")
         return
 
-    # Filtra pelo nome exato
-    found = [e for e in events if e['name'] == TARGET_NAME]
-
-    if not found:
+    if not matched:
         print(f"⚠️ Nenhum evento encontrado com o nome '{TARGET_NAME}'.")
         return
 
-    print(f"Encontrados {len(found)} registros. Iniciando remoção...")
+    print(f"Encontrados {matched} registros. Iniciando remoção...")
 
-    # 2. Deleta cada um que achou
-    for event in found:
-        try:
-            r = requests.delete(f"{API_URL}/{event['id']}")
-            if r.status_code == 200:
-                print(f"✅ Deletado: ID {event['id']} | Ano: {event['year_start']} | Continente: {event.get('continent')}")
-            else:
-                print(f"❌ Erro ao deletar ID {event['id']}: {r.text}")
-        except Exception as e:
-            print(f"❌ Erro de conexão ao tentar deletar: {e}")
+    # 2. Um único DELETE por filtro (o servidor apaga em lotes)
+    try:
+        r = requests.delete(API_URL, params={"name": TARGET_NAME})
+        if r.status_code == 200:
+            result = r.json()
+            print(f"✅ Deletados: {result['affected']} eventos em {result['batches']} lote(s)")
+        else:
+            print(f"❌ Erro ao deletar: {r.text}")
+    except Exception as e:
+        print(f"❌ Erro de conexão ao tentar deletar: {e}")
 
 if __name__ == "__main__":
-    delete_by_name()
\ No newline at end of file
+    delete_by_name()
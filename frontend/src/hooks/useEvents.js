@@ -1,17 +1,43 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { eventsApi } from '../services/api';
 
+// Intervalo entre consultas ao feed de mudanças (ETL rodando com o mapa aberto)
+const CHANGES_POLL_MS = 15000;
+
+// Mesma Feature que o GET /events monta no backend
+const toFeature = (e) => ({
+  type: 'Feature',
+  geometry: { type: 'Point', coordinates: [e.longitude, e.latitude] },
+  properties: {
+    id: e.id,
+    name: e.name,
+    description: e.description,
+    content: e.content,
+    year: e.year_start,
+    year_end: e.year_end,
+    period: e.period,
+    continent: e.continent,
+    source: e.source
+  }
+});
+
 export function useEvents(dateRange, selectedContinent) {
   const [allEvents, setAllEvents] = useState([]);
   const [mapEvents, setMapEvents] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Cursor do feed de mudanças (next_since da última chamada)
+  const changesCursor = useRef(null);
 
   const fetchEvents = useCallback(async () => {
     setIsLoading(true);
     setError(null);
 
     try {
+      // Marca o cursor ANTES da carga completa: o que mudar durante ela vem no próximo delta
+      const bookmark = await eventsApi.getChanges();
+      changesCursor.current = bookmark.data.next_since;
+
       const [allResponse, filteredResponse] = await Promise.all([
         eventsApi.getAll(),
         eventsApi.getFiltered(dateRange[0], dateRange[1], selectedContinent)
@@ -31,10 +57,54 @@ export function useEvents(dateRange, selectedContinent) {
     fetchEvents();
   }, [fetchEvents]);
 
+  const applyChanges = useCallback((upserts, deleted) => {
+    const changed = new Set([...deleted, ...upserts.map(e => e.id)]);
+    const inWindow = (e) =>
+      (selectedContinent === "Todos" || e.continent === selectedContinent) &&
+      e.year_start <= dateRange[1] &&
+      Math.max(e.year_start, e.year_end ?? e.year_start) >= dateRange[0];
+
+    setAllEvents(prev => prev
+      .filter(e => !changed.has(e.id))
+      .concat(upserts)
+      .sort((a, b) => a.year_start - b.year_start || a.id - b.id));
+
+    setMapEvents(prev => {
+      if (!prev) return prev;
+      return {
+        ...prev,
+        features: prev.features
+          .filter(f => !changed.has(f.properties.id))
+          .concat(upserts.filter(inWindow).map(toFeature))
+      };
+    });
+  }, [dateRange, selectedContinent]);
+
+  // Busca só o que mudou desde o cursor (página a página) e aplica no estado
+  const syncChanges = useCallback(async () => {
+    if (!changesCursor.current) return;
+    try {
+      let hasMore = true;
+      while (hasMore) {
+        const { data } = await eventsApi.getChanges(changesCursor.current);
+        if (data.upserts.length || data.deleted.length) applyChanges(data.upserts, data.deleted);
+        changesCursor.current = data.next_since;
+        hasMore = data.has_more;
+      }
+    } catch (err) {
+      console.error('Erro ao sincronizar mudanças:', err);
+    }
+  }, [applyChanges]);
+
+  useEffect(() => {
+    const timer = setInterval(syncChanges, CHANGES_POLL_MS);
+    return () => clearInterval(timer);
+  }, [syncChanges]);
+
   const createEvent = async (eventData) => {
     try {
       await eventsApi.create(eventData);
-      await fetchEvents();
+      await syncChanges();
       return { success: true };
     } catch (err) {
       return { success: false, error: err.message };
@@ -61,7 +131,7 @@ export function useEvents(dateRange, selectedContinent) {
   const filterEvents = useCallback((searchTerm) => {
     return allEvents.filter(e => {
       const matchesContinent = selectedContinent === "Todos" || e.continent === selectedContinent;
-      const matchesDate = e.year_start >= dateRange[0] && e.year_start <= dateRange[1];
+      const matchesDate = e.year_start <= dateRange[1] && Math.max(e.year_start, e.year_end ?? e.year_start) >= dateRange[0];
       const matchesSearch = e.name.toLowerCase().includes(searchTerm.toLowerCase());
       return matchesContinent && matchesDate && matchesSearch;
     });
@@ -73,6 +143,7 @@ export function useEvents(dateRange, selectedContinent) {
     isLoading,
     error,
     refresh: fetchEvents,
+    syncChanges,
     createEvent,
     deleteEvent,
     filterEvents
@@ -57,7 +57,7 @@ const MainPage = () => {
   });
 
   // --- Carregamento de Dados ---
-  const { allEvents, mapEvents, refresh: refreshEvents, createEvent, deleteEvent } = useEvents(dateRange, selectedContinent);
+  const { allEvents, mapEvents, syncChanges, createEvent, deleteEvent } = useEvents(dateRange, selectedContinent);
   const { startETL, progressTrigger } = useETL();
 
   // Busca filtros únicos do Banco (Distinct)
@@ -75,8 +75,8 @@ const MainPage = () => {
   }, [loadFilters, progressTrigger]); // Recarrega filtros se o ETL terminar
 
   useEffect(() => {
-    if (progressTrigger > 0) refreshEvents();
-  }, [progressTrigger, refreshEvents]);
+    if (progressTrigger > 0) syncChanges();
+  }, [progressTrigger, syncChanges]);
 
   // --- Lógica de Filtro e Ordenação (Computed) ---
   const filteredAndSortedEvents = useMemo(() => {
@@ -86,7 +86,8 @@ const MainPage = () => {
       const matchesContinent = selectedContinent === "Todos" || (e.continent || "") === selectedContinent;
       const matchesPeriod = selectedPeriod === "Todos" || (e.period || "") === selectedPeriod;
       const matchesSource = selectedSource === "Todos" || (e.source || "") === selectedSource;
-      const matchesDate = e.year_start >= dateRange[0] && e.year_start <= dateRange[1];
+      // Sobreposição de intervalos: eventos longos (guerras) aparecem em toda a janela que cobrem
+      const matchesDate = e.year_start <= dateRange[1] && Math.max(e.year_start, e.year_end ?? e.year_start) >= dateRange[0];
       
       return matchesSearch && matchesContinent && matchesPeriod && matchesSource && matchesDate;
     });
@@ -34,6 +34,9 @@ export const eventsApi = {
     return api.get(url);
   },
 
+  // Feed de mudanças desde o cursor (sem `since` devolve só o cursor atual)
+  getChanges: (since) => api.get('/events/changes', { params: since ? { since } : {} }),
+
   // Detecção espacial via PostGIS
   // Chamado automaticamente quando o usuário seleciona um ponto no mapa
   detectContinent: (lat, lon) => api.get(`/events/detect-continent?lat=${lat}&lon=${lon}`),